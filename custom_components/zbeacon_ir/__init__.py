@@ -4,7 +4,7 @@ import logging
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.typing import ConfigType
 
 from .const import (
@@ -12,7 +12,12 @@ from .const import (
     PLATFORMS,
 )
 
+from .capabilities import async_load_capabilities
+from .journal import DeviceJournal
+from .macro import MacroEngine, macro_store
 from .mqtt import MQTTClient
+from .schedule import ScheduleEngine, schedule_store
+from .services import async_setup_services, async_unload_services
 
 _LOGGING = logging.getLogger( __name__ )
 
@@ -57,14 +62,14 @@ async def async_setup_entry( hass: HomeAssistant, entry: ConfigEntry ) -> bool:
 
     store = Store( hass, 1, f"{DOMAIN}_{entry.entry_id}" )
 
-    cache = await store.async_load()
+    journal = DeviceJournal( hass, store, hass.config.path( STORAGE_DIR, f"{DOMAIN}_{entry.entry_id}.journal" ) )
 
-    if cache is None: cache = {}
+    cache = await journal.async_load()
 
-    await store.async_save( cache )
+    hass.data[ DOMAIN ][ entry.entry_id ][ "journal" ] = journal
+    hass.data[ DOMAIN ][ entry.entry_id ][ "cache"   ] = cache
 
-    hass.data[ DOMAIN ][ entry.entry_id ][ "store" ] = store
-    hass.data[ DOMAIN ][ entry.entry_id ][ "cache" ] = cache
+    hass.data[ DOMAIN ][ entry.entry_id ][ "capabilities" ] = await async_load_capabilities( hass )
 
     await hass.config_entries.async_forward_entry_setups( entry, PLATFORMS )
 
@@ -74,19 +79,33 @@ async def async_setup_entry( hass: HomeAssistant, entry: ConfigEntry ) -> bool:
 
     hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ] = mqtt_client
 
+    schedule = ScheduleEngine( hass, entry, mqtt_client )
+
+    await schedule.async_init()
+
+    hass.data[ DOMAIN ][ entry.entry_id ][ "schedule" ] = schedule
+
+    macro = MacroEngine( hass, entry, mqtt_client )
+
+    await macro.async_init()
+
+    hass.data[ DOMAIN ][ entry.entry_id ][ "macro" ] = macro
+
+    async_setup_services( hass )
+
     return True
 
 async def async_unload_entry( hass: HomeAssistant, entry: ConfigEntry ) -> bool:
 
     _LOGGING.warning( f"Unload Entry {entry.entry_id}" )
 
-    store = hass.data.get( DOMAIN, {} ).get( entry.entry_id, {} ).get( "store" )
+    journal = hass.data.get( DOMAIN, {} ).get( entry.entry_id, {} ).get( "journal" )
 
-    if store:
+    if journal:
 
         _LOGGING.warning( f"Remove Profile {DOMAIN}_{entry.entry_id}" )
 
-        await store.async_remove()
+        await journal.async_remove()
 
     if entry.entry_id in hass.data.get( DOMAIN, {} ):
 
@@ -100,6 +119,18 @@ async def async_unload_entry( hass: HomeAssistant, entry: ConfigEntry ) -> bool:
 
         hass.data[ DOMAIN ].pop( entry.entry_id )
 
+    if not hass.data.get( DOMAIN ):
+
+        async_unload_services( hass )
+
     await hass.config_entries.async_unload_platforms( entry, PLATFORMS )
 
     return True
+
+async def async_remove_entry( hass: HomeAssistant, entry: ConfigEntry ) -> None:
+
+    _LOGGING.warning( f"Remove Schedules And Macros {DOMAIN}_{entry.entry_id}" )
+
+    await schedule_store( hass, entry ).async_remove()
+
+    await macro_store( hass, entry ).async_remove()
@@ -30,16 +30,22 @@ async def async_setup_entry( hass: HomeAssistant, entry: ConfigEntry, async_add_
 	signal = hass.data[ DOMAIN ][ entry.entry_id ].setdefault( "signal", {} )
 
 	@callback
-	def async_discover( conf ):
+	def async_discover( confs ):
 
-		uuid = conf.get( "mac" )
+		entities = []
 
-		async_add_entities( [
+		for conf in confs:
 
-			ResetButton( hass, entry, uuid, f"{uuid}_reset", "button_reset" ),
+			uuid = conf.get( "mac" )
 
-			CustomButton( hass, entry, uuid, f"{uuid}_permit", "button_permit" ),
-		] )
+			entities.extend( [
+
+				ResetButton( hass, entry, uuid, f"{uuid}_reset", "button_reset" ),
+
+				CustomButton( hass, entry, uuid, f"{uuid}_permit", "button_permit" ),
+			] )
+
+		async_add_entities( entities )
 
 	signal[ "button" ] = async_dispatcher_connect( hass, ZBEACON_IR_EVENT_DEVICE_NEW, async_discover )
 
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import json
+import logging
+
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant
+from homeassistant.components.climate import HVACMode
+
+from .const import CAPABILITIES_FILE
+
+_LOGGING = logging.getLogger( __name__ )
+
+@dataclass( frozen = True, slots = True )
+class Capability:
+
+	min_temp: float
+
+	max_temp: float
+
+	hvac_modes: tuple[ HVACMode, ... ]
+
+	fan_modes: tuple[ str, ... ]
+
+	swing_v: bool
+
+	swing_h: bool
+
+class VendorCapabilities:
+
+	def __init__( self, data: dict ):
+
+		default = data.get( "default", {} )
+
+		self._default = self.__compile( default )
+
+		self._vendors = {
+			vendor.upper(): self.__compile( { **default, **conf } )
+			for vendor, conf in data.get( "vendors", {} ).items()
+		}
+
+	def get( self, vendor ) -> Capability:
+
+		if not isinstance( vendor, str ): return self._default
+
+		return self._vendors.get( vendor.upper(), self._default )
+
+	@staticmethod
+	def __compile( conf: dict ) -> Capability:
+
+		return Capability(
+			min_temp   = float( conf.get( "min_temp", 16 ) ),
+			max_temp   = float( conf.get( "max_temp", 30 ) ),
+			hvac_modes = tuple( HVACMode( mode ) for mode in conf.get( "hvac_modes", [] ) ),
+			fan_modes  = tuple( conf.get( "fan_modes", [] ) ),
+			swing_v    = bool( conf.get( "swing_v", False ) ),
+			swing_h    = bool( conf.get( "swing_h", False ) ),
+		)
+
+def _load_capabilities( override: str ) -> dict:
+
+	with open( os.path.join( os.path.dirname( __file__ ), "capabilities.json" ), encoding = "utf-8" ) as f:
+
+		data = json.load( f )
+
+	if os.path.isfile( override ):
+
+		_LOGGING.info( f"Load Capabilities {override}" )
+
+		with open( override, encoding = "utf-8" ) as f:
+
+			extra = json.load( f )
+
+		data[ "default" ] = { **data.get( "default", {} ), **extra.get( "default", {} ) }
+
+		for vendor, conf in extra.get( "vendors", {} ).items():
+
+			data[ "vendors" ][ vendor ] = { **data[ "vendors" ].get( vendor, {} ), **conf }
+
+	return data
+
+async def async_load_capabilities( hass: HomeAssistant ) -> VendorCapabilities:
+
+	data = await hass.async_add_executor_job( _load_capabilities, hass.config.path( CAPABILITIES_FILE ) )
+
+	return VendorCapabilities( data )
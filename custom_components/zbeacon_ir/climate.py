@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 import logging
 
 from typing import Any
@@ -7,10 +8,11 @@ from typing import Any
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE
+from homeassistant.exceptions import ServiceValidationError
 
 from homeassistant.components.climate import (
 	ClimateEntity,
@@ -23,22 +25,33 @@ from .const import (
 	ZBEACON_IR_EVENT_DEVICE_NEW,
 	ZBEACON_IR_EVENT_DEVICE_MSG,
 )
+from .profiler import profiled
+from .runtime import runtime_transition
+from .telemetry import TELEMETRY_SENSORS, telemetry_should_write
 
 _LOGGING = logging.getLogger( __name__ )
 
+TEMPERATURE_SENSOR = next( description for description in TELEMETRY_SENSORS if description.key == "temperature" )
+
 async def async_setup_entry( hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddConfigEntryEntitiesCallback ) -> None:
 
 	signal = hass.data[ DOMAIN ][ entry.entry_id ].setdefault( "signal", {} )
 
 	@callback
-	def async_discover( conf ):
+	def async_discover( confs ):
+
+		entities = []
+
+		for conf in confs:
+
+			uuid = conf.get( "mac" )
 
-		uuid = conf.get( "mac" )
+			entities.extend( [
 
-		async_add_entities( [
+				CustomClimate( hass, entry, uuid, f"{uuid}_irhvac", "climate_irhvac" )
+			] )
 
-			CustomClimate( hass, entry, uuid, f"{uuid}_irhvac", "climate_irhvac" )
-		] )
+		async_add_entities( entities )
 
 	signal[ "climate" ] = async_dispatcher_connect( hass, ZBEACON_IR_EVENT_DEVICE_NEW, async_discover )
 
@@ -142,11 +155,13 @@ class CustomClimate( ClimateEntity ):
 
 		self._attr_fan_mode = "auto"
 
-		self._attr_supported_features = (
-			ClimateEntityFeature.TARGET_TEMPERATURE |
-			ClimateEntityFeature.TARGET_TEMPERATURE_RANGE |
-			ClimateEntityFeature.FAN_MODE
-		)
+		self._attr_swing_mode = "off"
+
+		self._attr_swing_horizontal_mode = "off"
+
+		self._capabilities = hass.data[ DOMAIN ][ entry.entry_id ][ "capabilities" ]
+
+		self.__apply_capability( None )
 
 		self._attr_device_info = DeviceInfo(
 			connections = { ( CONNECTION_NETWORK_MAC, uuid ) },
@@ -177,6 +192,18 @@ class CustomClimate( ClimateEntity ):
 
 				self._attr_fan_mode = self.__to_attr_fan_mode( irhvac.get( "FanSpeed" ) )
 
+				self._attr_swing_mode = self.__to_attr_swing_mode( irhvac.get( "SwingV" ) )
+
+				self._attr_swing_horizontal_mode = self.__to_attr_swing_mode( irhvac.get( "SwingH" ) )
+
+				self.__apply_capability( irhvac.get( "Vendor" ) )
+
+		self._attr_current_temperature = mqtt.parse_temperature( mqtt.find_telemetry( uuid, "SENSOR" ) )
+
+		self._temperature_written = None
+
+		self._attr_extra_state_attributes = { "stale": mqtt.is_stale( uuid ) }
+
 	async def async_added_to_hass( self ) -> None:
 
 		self._event_signal = async_dispatcher_connect(
@@ -185,6 +212,10 @@ class CustomClimate( ClimateEntity ):
 			self.__async_device_event
 		)
 
+		# The retained LWT is dispatched before this entity subscribes, resume accounting from the cached state.
+
+		self.__account()
+
 		_LOGGING.debug( f"async_added_to_hass( {self._attr_unique_id} )" )
 
 	async def async_will_remove_from_hass( self ) -> None:
@@ -193,6 +224,7 @@ class CustomClimate( ClimateEntity ):
 
 		_LOGGING.debug( f"async_will_remove_from_hass( {self._attr_unique_id} )" )
 
+	@profiled( "climate.set_fan_mode" )
 	async def async_set_fan_mode( self, mode: str ) -> None:
 
 		mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
@@ -201,9 +233,11 @@ class CustomClimate( ClimateEntity ):
 
 		if not isinstance( conf, dict ): return
 
-		conf[ "FanSpeed" ] = mode
+		if mode not in self._attr_fan_modes:
+
+			raise ServiceValidationError( f"Fan mode {mode} is not supported by {conf.get( 'Vendor' )}" )
 
-		# await mqtt.async_cache_dumps()
+		conf[ "FanSpeed" ] = mode
 
 		if self.__to_attr_hvac_mode( conf[ "Mode" ] ) != HVACMode.OFF:
 
@@ -213,6 +247,7 @@ class CustomClimate( ClimateEntity ):
 
 		self.async_write_ha_state()
 
+	@profiled( "climate.set_hvac_mode" )
 	async def async_set_hvac_mode( self, mode: HVACMode ) -> None:
 
 		mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
@@ -221,6 +256,10 @@ class CustomClimate( ClimateEntity ):
 
 		if not isinstance( conf, dict ): return
 
+		if mode not in self._attr_hvac_modes:
+
+			raise ServiceValidationError( f"HVAC mode {mode} is not supported by {conf.get( 'Vendor' )}" )
+
 		if mode == HVACMode.OFF:
 
 			conf[ "Power" ] = "Off"
@@ -239,14 +278,13 @@ class CustomClimate( ClimateEntity ):
 			elif mode == HVACMode.HEAT:
 				conf[ "Mode" ] = "Heat"
 
-		# await mqtt.async_cache_dumps()
-
 		await mqtt.async_cmnd_irhvac( self.uuid )
 
 		self._attr_hvac_mode = mode
 
 		self.async_write_ha_state()
 
+	@profiled( "climate.set_temperature" )
 	async def async_set_temperature( self, **kwargs: Any) -> None:
 
 		temp = int( kwargs.get( ATTR_TEMPERATURE ) )
@@ -257,11 +295,13 @@ class CustomClimate( ClimateEntity ):
 
 		if not isinstance( conf, dict ): return
 
+		if temp < self._attr_min_temp or temp > self._attr_max_temp:
+
+			raise ServiceValidationError( f"Temperature {temp} is out of range for {conf.get( 'Vendor' )}" )
+
 		conf[ "Celsius" ] = "On"
 		conf[ "Temp"    ] = temp
 
-		# await mqtt.async_cache_dumps()
-
 		if self.__to_attr_hvac_mode( conf[ "Mode" ] ) != HVACMode.OFF:
 
 			await mqtt.async_cmnd_irhvac( self.uuid )
@@ -270,6 +310,91 @@ class CustomClimate( ClimateEntity ):
 
 		self.async_write_ha_state()
 
+	@profiled( "climate.set_swing_mode" )
+	async def async_set_swing_mode( self, mode: str ) -> None:
+
+		await self.__async_set_swing( "SwingV", mode, self._capability.swing_v )
+
+		self._attr_swing_mode = mode
+
+		self.async_write_ha_state()
+
+	@profiled( "climate.set_swing_horizontal_mode" )
+	async def async_set_swing_horizontal_mode( self, mode: str ) -> None:
+
+		await self.__async_set_swing( "SwingH", mode, self._capability.swing_h )
+
+		self._attr_swing_horizontal_mode = mode
+
+		self.async_write_ha_state()
+
+	async def __async_set_swing( self, key: str, mode: str, supported: bool ) -> None:
+
+		mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
+
+		conf = mqtt.find_device( self.uuid ).get( "irhvac" )
+
+		if not isinstance( conf, dict ): return
+
+		if not supported:
+
+			raise ServiceValidationError( f"Swing is not supported by {conf.get( 'Vendor' )}" )
+
+		conf[ key ] = "Auto" if mode == "on" else "Off"
+
+		if self.__to_attr_hvac_mode( conf[ "Mode" ] ) != HVACMode.OFF:
+
+			await mqtt.async_cmnd_irhvac( self.uuid )
+
+	def __account( self ) -> None:
+
+		mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
+
+		device = mqtt.find_device( self.uuid )
+
+		if not isinstance( device, dict ): return
+
+		mode = str( self._attr_hvac_mode ) if self._attr_available else None
+
+		if runtime_transition( device, mode, self._attr_target_temperature ):
+
+			mqtt.schedule_cache_dumps( self.uuid )
+
+			async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{self.uuid}", "RUNTIME", None )
+
+	def __apply_capability( self, vendor ) -> None:
+
+		capability = self._capabilities.get( vendor )
+
+		self._capability = capability
+
+		self._attr_min_temp = capability.min_temp
+		self._attr_max_temp = capability.max_temp
+
+		self._attr_hvac_modes = list( capability.hvac_modes )
+
+		self._attr_fan_modes = list( capability.fan_modes )
+
+		features = (
+			ClimateEntityFeature.TARGET_TEMPERATURE |
+			ClimateEntityFeature.TARGET_TEMPERATURE_RANGE |
+			ClimateEntityFeature.FAN_MODE
+		)
+
+		if capability.swing_v: features |= ClimateEntityFeature.SWING_MODE
+
+		if capability.swing_h: features |= ClimateEntityFeature.SWING_HORIZONTAL_MODE
+
+		self._attr_supported_features = features
+
+	def __to_attr_swing_mode( self, mode: str ):
+
+		if not isinstance( mode, str ) or mode.lower() in ( "off", "no", "false", "0" ):
+
+			return "off"
+
+		return "on"
+
 	def __to_attr_hvac_mode( self, mode: str ):
 
 		if not isinstance( mode, str ):
@@ -301,6 +426,8 @@ class CustomClimate( ClimateEntity ):
 			else:
 				self._attr_available = False
 
+			self.__account()
+
 			self.async_write_ha_state()
 
 		elif name == "SET":
@@ -319,4 +446,36 @@ class CustomClimate( ClimateEntity ):
 
 			self._attr_fan_mode = self.__to_attr_fan_mode( data.get( "FanSpeed" ) )
 
+			self._attr_swing_mode = self.__to_attr_swing_mode( data.get( "SwingV" ) )
+
+			self._attr_swing_horizontal_mode = self.__to_attr_swing_mode( data.get( "SwingH" ) )
+
+			self.__apply_capability( data.get( "Vendor" ) )
+
+			self.__account()
+
+			self.async_write_ha_state()
+
+		elif name == "STALE":
+
+			self._attr_extra_state_attributes = { "stale": data }
+
+			self.async_write_ha_state()
+
+		elif name == "SENSOR":
+
+			mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
+
+			temp = mqtt.parse_temperature( data )
+
+			if temp is None: return
+
+			now = time.monotonic()
+
+			if not telemetry_should_write( TEMPERATURE_SENSOR, temp, self._attr_current_temperature, self._temperature_written, now ): return
+
+			self._attr_current_temperature = temp
+
+			self._temperature_written = now
+
 			self.async_write_ha_state()
@@ -4,9 +4,22 @@ import logging
 
 from typing import Any
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+import voluptuous as vol
 
-from .const import DOMAIN
+from homeassistant.core import callback
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
+
+from .const import (
+    CONF_MODELS,
+    CONF_OFFLINE_COMMAND_EXPIRY,
+    CONF_POLL_INTERVAL,
+    CONF_SHADOW_TOPIC,
+    DEFAULT_MODELS,
+    DEFAULT_OFFLINE_COMMAND_EXPIRY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SHADOW_TOPIC,
+    DOMAIN,
+)
 
 _LOGGING = logging.getLogger( __name__ )
 
@@ -18,6 +31,12 @@ class FlowHandler( ConfigFlow, domain = DOMAIN ):
 
         _LOGGING.debug( "ConfigFlow Initialize" )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow( config_entry: ConfigEntry ) -> OptionsFlow:
+
+        return OptionsFlowHandler()
+
     async def async_step_user( self, user_input: dict[ str, Any ] | None = None ) -> ConfigFlowResult:
 
         if self._async_current_entries():
@@ -25,3 +44,34 @@ class FlowHandler( ConfigFlow, domain = DOMAIN ):
             return self.async_abort( reason = "single_instance_allowed" )
 
         return self.async_create_entry( title = "ZbeaconIR", data = {} )
+
+class OptionsFlowHandler( OptionsFlow ):
+
+    async def async_step_init( self, user_input: dict[ str, Any ] | None = None ) -> ConfigFlowResult:
+
+        if user_input is not None:
+
+            return self.async_create_entry( data = user_input )
+
+        options = self.config_entry.options
+
+        schema = vol.Schema( {
+            vol.Optional(
+                CONF_MODELS,
+                default = options.get( CONF_MODELS, DEFAULT_MODELS )
+            ): str,
+            vol.Optional(
+                CONF_OFFLINE_COMMAND_EXPIRY,
+                default = options.get( CONF_OFFLINE_COMMAND_EXPIRY, DEFAULT_OFFLINE_COMMAND_EXPIRY )
+            ): vol.All( vol.Coerce( int ), vol.Range( min = 0 ) ),
+            vol.Optional(
+                CONF_POLL_INTERVAL,
+                default = options.get( CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL )
+            ): vol.All( vol.Coerce( int ), vol.Range( min = 0 ) ),
+            vol.Optional(
+                CONF_SHADOW_TOPIC,
+                default = options.get( CONF_SHADOW_TOPIC, DEFAULT_SHADOW_TOPIC )
+            ): str,
+        } )
+
+        return self.async_show_form( step_id = "init", data_schema = schema )
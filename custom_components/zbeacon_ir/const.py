@@ -9,7 +9,80 @@ PLATFORMS = [
     Platform.SENSOR,
 ]
 
+CAPABILITIES_FILE = "zbeacon_ir_capabilities.json"
+
 TASMOTA_DISCOVERY_TOPIC = "tasmota/discovery/+/config"
 
+CONF_MODELS = "models"
+
+DEFAULT_MODELS = "Athom IR Remote, Athom lR Remote"
+
 ZBEACON_IR_EVENT_DEVICE_MSG = "zbeacon_ir_device_msg"
 ZBEACON_IR_EVENT_DEVICE_NEW = "zbeacon_ir_device_new"
+
+SERVICE_REMOVE_DEVICES = "remove_devices"
+
+SERVICE_PROFILE = "profile"
+
+SERVICE_SET_SCHEDULE = "set_schedule"
+
+SERVICE_REMOVE_SCHEDULE = "remove_schedule"
+
+SERVICE_BIND_BLASTERS = "bind_blasters"
+
+SERVICE_SET_MACRO = "set_macro"
+
+SERVICE_REMOVE_MACRO = "remove_macro"
+
+SERVICE_RUN_MACRO = "run_macro"
+
+REMOVE_DEVICES_CONCURRENCY = 16
+
+CONF_OFFLINE_COMMAND_EXPIRY = "offline_command_expiry"
+
+DEFAULT_OFFLINE_COMMAND_EXPIRY = 300
+
+CONF_POLL_INTERVAL = "poll_interval"
+
+CONF_SHADOW_TOPIC = "shadow_topic"
+
+DEFAULT_POLL_INTERVAL = 900
+
+DEFAULT_SHADOW_TOPIC = ""
+
+POLL_TICK = 5.0
+
+POLL_TICK_BUDGET = 20
+
+POLL_JITTER = 0.2
+
+INGEST_WINDOW = 0.5
+
+INGEST_BATCH_MAX = 500
+
+STORE_SAVE_DELAY = 1.0
+
+SCHEDULE_CONCURRENCY = 8
+
+SCHEDULE_SPACING = 0.05
+
+GROUP_HEALTH_WEIGHT = 0.3
+
+GROUP_ACK_TIMEOUT = 10.0
+
+GROUP_PROBE_INTERVAL = 300.0
+
+RUNTIME_BAND = 2
+
+RUNTIME_REFRESH = 60
+
+JOURNAL_COMPACT_MIN = 1000
+
+JOURNAL_COMPACT_RATIO = 2
+
+TASK_LIMITS = {
+    "irhvac":   16,
+    "publish":  16,
+    "poll":     4,
+    "schedule": 1,
+}
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import DOMAIN
+
+TO_REDACT = {
+	"uuid",
+	"mac",
+	"topic",
+	"members",
+	"SSId",
+	"BSSId",
+	"IPAddress",
+	"Hostname",
+}
+
+async def async_get_config_entry_diagnostics( hass: HomeAssistant, entry: ConfigEntry ) -> dict[ str, Any ]:
+
+	data = hass.data[ DOMAIN ][ entry.entry_id ]
+
+	mqtt    = data[ "mqtt"    ]
+	journal = data[ "journal" ]
+
+	now = time.time()
+
+	stats = dict( journal.stats )
+
+	for key in ( "last_append", "last_compact" ):
+
+		if stats[ key ] is not None: stats[ f"{key}_age" ] = round( now - stats[ key ], 3 )
+
+	return {
+		"options": dict( entry.options ),
+		"mqtt":    mqtt.diagnostics(),
+		"storage": { **stats, **await journal.async_sizes() },
+		"devices": [
+			async_redact_data( mqtt.device_diagnostics( uuid ), TO_REDACT )
+			for uuid in mqtt.device_uuids()
+		],
+	}
+
+async def async_get_device_diagnostics( hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry ) -> dict[ str, Any ]:
+
+	mqtt = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+	for domain, uuid in device.identifiers:
+
+		if domain == DOMAIN:
+
+			return async_redact_data( mqtt.device_diagnostics( uuid ), TO_REDACT )
+
+	return {}
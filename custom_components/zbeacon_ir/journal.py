@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import asyncio
+import logging
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import (
+	JOURNAL_COMPACT_MIN,
+	JOURNAL_COMPACT_RATIO,
+	STORE_SAVE_DELAY,
+)
+from .profiler import profiled
+
+_LOGGING = logging.getLogger( __name__ )
+
+def _journal_replay( path: str, cache: dict, seq: int ) -> tuple[ int, int ]:
+
+	if not os.path.isfile( path ): return 0, seq
+
+	count = 0
+
+	with open( path, encoding = "utf-8" ) as f:
+
+		for line in f:
+
+			try:
+				entry = json.loads( line )
+
+			except ValueError:
+				_LOGGING.warning( f"Journal {path} Truncated After {count} Entries" )
+
+				break
+
+			if entry.get( "s", seq + 1 ) <= seq: continue
+
+			seq = entry.get( "s", seq + 1 )
+
+			if entry.get( "v" ) is None:
+
+				cache.pop( entry.get( "k" ), None )
+			else:
+				cache[ entry[ "k" ] ] = entry[ "v" ]
+
+			count += 1
+
+	return count, seq
+
+def _journal_append( path: str, lines: list[ str ] ) -> int:
+
+	with open( path, "a", encoding = "utf-8" ) as f:
+
+		f.writelines( lines )
+
+		f.flush()
+
+		os.fsync( f.fileno() )
+
+		return f.tell()
+
+def _journal_truncate( path: str ) -> None:
+
+	with open( path, "w", encoding = "utf-8" ) as f:
+
+		f.flush()
+
+		os.fsync( f.fileno() )
+
+def _journal_size( path: str ) -> int:
+
+	return os.path.getsize( path ) if os.path.isfile( path ) else 0
+
+def _journal_remove( path: str ) -> None:
+
+	if os.path.isfile( path ): os.remove( path )
+
+class DeviceJournal:
+
+	def __init__( self, hass: HomeAssistant, store: Store, path: str ):
+
+		self.hass  = hass
+		self.store = store
+		self.path  = path
+
+		self._cache = {}
+
+		self._dirty = set()
+
+		self._entries = 0
+
+		self._seq = 0
+
+		self._lock = asyncio.Lock()
+
+		self._unsub = None
+
+		self._unsub_final = None
+
+		self._final = []
+
+		self.stats = {
+			"append":       0,
+			"compact":      0,
+			"written":      0,
+			"entries":      0,
+			"bytes":        0,
+			"last_append":  None,
+			"last_compact": None,
+		}
+
+	async def async_load( self ) -> dict:
+
+		snapshot = await self.store.async_load()
+
+		if snapshot is None: snapshot = { "seq": 0, "devices": {} }
+
+		# Snapshots written before the sequence was introduced hold the devices directly
+
+		if not isinstance( snapshot.get( "devices" ), dict ) or "seq" not in snapshot: snapshot = { "seq": 0, "devices": snapshot }
+
+		cache = snapshot[ "devices" ]
+
+		replayed, self._seq = await self.hass.async_add_executor_job( _journal_replay, self.path, cache, snapshot[ "seq" ] )
+
+		self._cache = cache
+
+		if replayed:
+
+			_LOGGING.info( f"Journal Replay {replayed} Entries" )
+
+		await self.async_compact()
+
+		self._unsub_final = self.hass.bus.async_listen_once( EVENT_HOMEASSISTANT_FINAL_WRITE, self.__async_final_write )
+
+		return cache
+
+	@callback
+	def async_mark( self, uuid: str ) -> None:
+
+		self._dirty.add( uuid )
+
+		if self._unsub is None:
+
+			self._unsub = async_call_later( self.hass, STORE_SAVE_DELAY, self.__async_flush_later )
+
+	@callback
+	def async_on_final_write( self, hook ):
+
+		self._final.append( hook )
+
+		return lambda: self._final.remove( hook )
+
+	@profiled( "journal.append" )
+	async def async_flush( self ) -> None:
+
+		if self._unsub is not None:
+
+			self._unsub()
+
+			self._unsub = None
+
+		if not self._dirty: return
+
+		dirty = self._dirty
+
+		self._dirty = set()
+
+		async with self._lock:
+
+			lines = []
+
+			for uuid in dirty:
+
+				self._seq += 1
+
+				lines.append( json.dumps( { "s": self._seq, "k": uuid, "v": self._cache.get( uuid ) }, separators = ( ",", ":" ) ) + "\n" )
+
+			self.stats[ "bytes" ] = await self.hass.async_add_executor_job( _journal_append, self.path, lines )
+
+		self._entries += len( lines )
+
+		self.stats[ "append"      ] += 1
+		self.stats[ "written"     ] += len( lines )
+		self.stats[ "entries"     ] = self._entries
+		self.stats[ "last_append" ] = time.time()
+
+		if self._entries > max( JOURNAL_COMPACT_MIN, len( self._cache ) * JOURNAL_COMPACT_RATIO ):
+
+			await self.async_compact()
+
+	@profiled( "journal.compact" )
+	async def async_compact( self ) -> None:
+
+		async with self._lock:
+
+			self._dirty.clear()
+
+			await self.store.async_save( { "seq": self._seq, "devices": self._cache } )
+
+			await self.hass.async_add_executor_job( _journal_truncate, self.path )
+
+		self._entries = 0
+
+		self.stats[ "compact"      ] += 1
+		self.stats[ "entries"      ] = 0
+		self.stats[ "bytes"        ] = 0
+		self.stats[ "last_compact" ] = time.time()
+
+	async def async_sizes( self ) -> dict:
+
+		return {
+			"snapshot": await self.hass.async_add_executor_job( _journal_size, self.store.path ),
+			"journal":  await self.hass.async_add_executor_job( _journal_size, self.path ),
+		}
+
+	async def async_close( self ) -> None:
+
+		if self._unsub_final is not None:
+
+			self._unsub_final()
+
+			self._unsub_final = None
+
+		for hook in list( self._final ): hook()
+
+		await self.async_flush()
+
+	async def async_remove( self ) -> None:
+
+		await self.async_close()
+
+		await self.store.async_remove()
+
+		await self.hass.async_add_executor_job( _journal_remove, self.path )
+
+	@callback
+	def __async_flush_later( self, _now ) -> None:
+
+		self._unsub = None
+
+		self.hass.async_create_task( self.async_flush() )
+
+	async def __async_final_write( self, _event: Event ) -> None:
+
+		self._unsub_final = None
+
+		for hook in list( self._final ): hook()
+
+		await self.async_flush()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.storage import Store
+
+from .const import (
+	DOMAIN,
+	STORE_SAVE_DELAY,
+)
+
+_LOGGING = logging.getLogger( __name__ )
+
+def compile_macro( steps: list[ dict ] ) -> dict[ str, list[ tuple ] ]:
+
+	timelines = {}
+
+	for index, step in enumerate( steps ):
+
+		timeline = timelines.setdefault( step[ "mac" ], [] )
+
+		offset = ( timeline[ -1 ][ 1 ] if timeline else 0.0 ) + float( step.get( "delay", 0.0 ) )
+
+		payload = step.get( "payload", "" )
+
+		if not isinstance( payload, str ): payload = json.dumps( payload )
+
+		timeline.append( ( index, offset, step.get( "command", "IRHVAC" ), payload ) )
+
+	return timelines
+
+def macro_store( hass: HomeAssistant, entry: ConfigEntry ) -> Store:
+
+	return Store( hass, 1, f"{DOMAIN}_{entry.entry_id}_macros" )
+
+class MacroEngine:
+
+	def __init__( self, hass: HomeAssistant, entry: ConfigEntry, client ):
+
+		self.hass   = hass
+		self.entry  = entry
+		self.client = client
+
+		self._store = macro_store( hass, entry )
+
+		self._macros = {}
+
+		self._compiled = {}
+
+		self._dirty = False
+
+	async def async_init( self ) -> None:
+
+		self._macros = await self._store.async_load() or {}
+
+		self._compiled = { macro_id: compile_macro( steps ) for macro_id, steps in self._macros.items() }
+
+		_LOGGING.info( f"Load {len( self._macros )} Macros" )
+
+		self.entry.async_on_unload( self.async_shutdown )
+
+	async def async_shutdown( self ) -> None:
+
+		if self._dirty:
+
+			self._dirty = False
+
+			await self._store.async_save( self._macros )
+
+	@callback
+	def async_set( self, macro_id: str, steps: list[ dict ] ) -> None:
+
+		self._macros[ macro_id ] = steps
+
+		self._compiled[ macro_id ] = compile_macro( steps )
+
+		self._dirty = True
+
+		self._store.async_delay_save( lambda: self._macros, STORE_SAVE_DELAY )
+
+	@callback
+	def async_delete( self, macro_id: str ) -> bool:
+
+		if self._macros.pop( macro_id, None ) is None: return False
+
+		self._compiled.pop( macro_id, None )
+
+		self._dirty = True
+
+		self._store.async_delay_save( lambda: self._macros, STORE_SAVE_DELAY )
+
+		return True
+
+	async def async_run( self, macro_id: str ) -> dict | None:
+
+		timelines = self._compiled.get( macro_id )
+
+		if timelines is None: return None
+
+		loop = asyncio.get_running_loop()
+
+		start = loop.time()
+
+		report = []
+
+		async def play( uuid, timeline ):
+
+			device = self.client.find_device( uuid )
+
+			topic = device.get( "topic" ) if isinstance( device, dict ) else None
+
+			for index, offset, command, payload in timeline:
+
+				delay = start + offset - loop.time()
+
+				if delay > 0: await asyncio.sleep( delay )
+
+				sent = loop.time()
+
+				error = None
+
+				try:
+					if topic is None: raise ValueError( f"Unknown Device {uuid}" )
+
+					await self.client.async_publish( f"cmnd/{topic}/{command}", payload )
+
+				except Exception as err:
+					error = str( err )
+
+				report.append( {
+					"step":     index,
+					"mac":      uuid,
+					"command":  command,
+					"planned":  round( offset, 3 ),
+					"actual":   round( sent - start, 3 ),
+					"duration": round( loop.time() - sent, 3 ),
+					"error":    error,
+				} )
+
+		await asyncio.gather( *[ play( uuid, timeline ) for uuid, timeline in timelines.items() ] )
+
+		report.sort( key = lambda step: step[ "step" ] )
+
+		elapsed = loop.time() - start
+
+		_LOGGING.info( f"Macro {macro_id} Done In {elapsed:.3f}s" )
+
+		return { "elapsed": round( elapsed, 3 ), "steps": report }
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import sys
 import json
 import time
+import asyncio
 import logging
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt import (
@@ -17,11 +20,27 @@ from homeassistant.components.mqtt import (
 )
 
 from .const import (
+	CONF_MODELS,
+	CONF_OFFLINE_COMMAND_EXPIRY,
+	CONF_SHADOW_TOPIC,
+	DEFAULT_MODELS,
+	DEFAULT_OFFLINE_COMMAND_EXPIRY,
+	DEFAULT_SHADOW_TOPIC,
 	DOMAIN,
+	GROUP_ACK_TIMEOUT,
+	GROUP_HEALTH_WEIGHT,
+	GROUP_PROBE_INTERVAL,
+	INGEST_BATCH_MAX,
+	INGEST_WINDOW,
+	REMOVE_DEVICES_CONCURRENCY,
 	TASMOTA_DISCOVERY_TOPIC,
 	ZBEACON_IR_EVENT_DEVICE_NEW,
 	ZBEACON_IR_EVENT_DEVICE_MSG,
 )
+from .poller import ReconcilePoller
+from .profiler import async_get_profiler
+from .runtime import runtime_reset, runtime_running, runtime_transition
+from .tasks import TaskManager
 
 _LOGGING = logging.getLogger( __name__ )
 
@@ -32,20 +51,75 @@ class MQTTClient:
 		self.hass  = hass
 		self.entry = entry
 
-		self._store = hass.data[ DOMAIN ][ entry.entry_id ][ "store" ]
+		self._journal = hass.data[ DOMAIN ][ entry.entry_id ][ "journal" ]
 		self._cache = hass.data[ DOMAIN ][ entry.entry_id ][ "cache" ]
 
 		self._sub_state = None
 
+		self.tasks = TaskManager( hass )
+
+		self._profiler = async_get_profiler( hass )
+
+		self._shadow = entry.options.get( CONF_SHADOW_TOPIC, DEFAULT_SHADOW_TOPIC ).strip( "/" )
+
+		self.stats = {
+			"publish":    0,
+			"discovery":  0,
+			"stat":       0,
+			"tele":       0,
+			"shadow":     0,
+			"busy":       0.0,
+		}
+
 		self._devices = {}
 
+		self._lwt = {}
+
+		self._models_raw = None
+
+		self._models = frozenset()
+
+		self._models_bytes = ()
+
+		self._pending = {}
+
+		self._telemetry = {}
+
+		self._heard = {}
+
+		self._sent = {}
+
+		self._latency = {}
+
+		self._health = {}
+
+		self._groups = {}
+
+		self._stale = set()
+
+		self._created = set()
+
+		self._ingest = {}
+
+		self._ingest_lwt = {}
+
+		self._ingest_unsub = None
+
+		self._poller = ReconcilePoller( hass, self )
+
 		for device in self._cache.values():
 
 			device[ "LWT" ] = None
 
+			runtime_reset( device )
+
 			self._devices[ device.get( "uuid"  ) ] = device
 			self._devices[ device.get( "topic" ) ] = device
 
+			for member in device.get( "members", [] ):
+
+				self._groups.setdefault( member, set() ).add( device.get( "uuid" ) )
+
 	async def async_init( self ) -> None:
 
 		_LOGGING.info( "MQTT Subscribe Topics" )
@@ -54,33 +128,45 @@ class MQTTClient:
 
 			"tasmota_discovery": {
 				"topic": TASMOTA_DISCOVERY_TOPIC,
-				"msg_callback": self.__on_discovery,
+				"msg_callback": self.__timed( "discovery", self.__on_discovery ),
 				"qos": 0,
 				"event_loop_safe": True
 			},
 			"tasmota_stat": {
 				"topic": "stat/#",
-				"msg_callback": self.__on_tasmota_stat,
+				"msg_callback": self.__timed( "stat", self.__on_tasmota_stat ),
 				"qos": 0,
 				"event_loop_safe": True
 			},
 			"tasmota_tele": {
 				"topic": "tele/#",
-				"msg_callback": self.__on_tasmota_tele,
+				"msg_callback": self.__timed( "tele", self.__on_tasmota_tele ),
 				"qos": 0,
 				"event_loop_safe": True
 			}
 		}
 
+		if self._shadow:
+
+			topics[ "shadow" ] = {
+				"topic": f"{self._shadow}/+/+",
+				"msg_callback": self.__timed( "shadow", self.__on_shadow ),
+				"qos": 1,
+				"event_loop_safe": True
+			}
+
 		self._sub_state = await self._subscribe_topics( self._sub_state, topics )
 
-		self.entry.async_on_unload( self.async_shutdown )
+		self._poller.async_start()
 
-	async def async_cache_dumps( self ) -> None:
+		self.entry.async_on_unload( self._journal.async_on_final_write( self.__close_runtime ) )
 
-		_LOGGING.info( f"Update Profile {DOMAIN}_{self.entry.entry_id}" )
+		self.entry.async_on_unload( self.async_shutdown )
 
-		await self._store.async_save( self._cache )
+	@callback
+	def schedule_cache_dumps( self, uuid: str ) -> None:
+
+		self._journal.async_mark( uuid )
 
 	async def async_cmnd_irhvac( self, uuid, qos: int | None = None, retain: bool | None = None ) -> None:
 
@@ -107,7 +193,186 @@ class MQTTClient:
 			"Temp":     irhvac[ "Temp"     ],
 		}
 
-		await mqtt.async_publish( self.hass, f"cmnd/{topic}/IRHVAC", json.dumps( payload ), qos, retain )
+		for key in ( "SwingV", "SwingH" ):
+
+			if key in irhvac: payload[ key ] = irhvac[ key ]
+
+		targets = self.__targets( device )
+
+		if not targets:
+
+			_LOGGING.debug( f"Device {uuid} Offline, Hold IRHVAC" )
+
+			self._pending[ device[ "uuid" ] ] = ( payload, qos, retain, time.time() )
+
+			return
+
+		self._pending.pop( device[ "uuid" ], None )
+
+		self.__publish_shadow( device, "desired", payload )
+
+		await self.__async_send_irhvac( device[ "uuid" ], targets, json.dumps( payload ), qos, retain )
+
+	async def async_flush_irhvac( self, uuid: str ) -> None:
+
+		pending = self._pending.pop( uuid, None )
+
+		if pending is None: return
+
+		payload, qos, retain, timestamp = pending
+
+		expiry = self.entry.options.get( CONF_OFFLINE_COMMAND_EXPIRY, DEFAULT_OFFLINE_COMMAND_EXPIRY )
+
+		if time.time() - timestamp > expiry:
+
+			_LOGGING.debug( f"Device {uuid} Drop Expired IRHVAC" )
+
+			return
+
+		device = self._devices.get( uuid )
+
+		if not isinstance( device, dict ): return
+
+		targets = self.__targets( device )
+
+		if not targets:
+
+			self._pending[ uuid ] = pending
+
+			return
+
+		_LOGGING.info( f"Device {uuid} Online, Flush IRHVAC" )
+
+		await self.__async_send_irhvac( uuid, targets, json.dumps( payload ), qos, retain )
+
+	async def __async_send_irhvac( self, primary: str, targets: list[ dict ], data: str, qos: int | None, retain: bool | None ) -> None:
+
+		async def send( target ):
+
+			uuid = target[ "uuid" ]
+
+			now = time.monotonic()
+
+			self.__expire( uuid, now )
+
+			self._sent[ uuid ] = ( now, primary )
+
+			self._health.setdefault( uuid, { "ack": None, "latency": None, "tried": now } )[ "tried" ] = now
+
+			await self.async_publish( f"cmnd/{target[ 'topic' ]}/IRHVAC", data, qos, retain )
+
+		await asyncio.gather( *[ send( target ) for target in targets ] )
+
+	def __targets( self, device: dict ) -> list[ dict ]:
+
+		group = [ device ]
+
+		for member in device.get( "members", [] ):
+
+			member = self._devices.get( member )
+
+			if isinstance( member, dict ) and isinstance( member.get( "uuid" ), str ): group.append( member )
+
+		online = [ target for target in group if target.get( "LWT" ) in ( None, "Online" ) ]
+
+		if device.get( "strategy" ) == "best" and len( online ) > 1:
+
+			now = time.monotonic()
+
+			for target in online: self.__expire( target[ "uuid" ], now )
+
+			best = max( online, key = self.__score )
+
+			# Members left idle for a while get the command too, so their score follows their current health
+
+			return [ best, *[
+				target for target in online
+				if target is not best and now - self._health.get( target[ "uuid" ], {} ).get( "tried", 0.0 ) > GROUP_PROBE_INTERVAL
+			] ]
+
+		return online
+
+	def __score( self, device: dict ) -> tuple[ float, float ]:
+
+		health = self._health.get( device[ "uuid" ] )
+
+		if health is None or health[ "ack" ] is None: return ( 1.0, 0.0 )
+
+		return ( round( health[ "ack" ], 1 ), -round( health[ "latency" ] or 0.0, 2 ) )
+
+	def __observe( self, uuid: str, ack: bool, elapsed: float | None = None ) -> None:
+
+		health = self._health.get( uuid )
+
+		if health is None: return
+
+		if health[ "ack" ] is None:
+
+			health[ "ack" ] = 1.0 if ack else 0.0
+		else:
+			health[ "ack" ] += GROUP_HEALTH_WEIGHT * ( ( 1.0 if ack else 0.0 ) - health[ "ack" ] )
+
+		if elapsed is None: return
+
+		if health[ "latency" ] is None:
+
+			health[ "latency" ] = elapsed
+		else:
+			health[ "latency" ] += GROUP_HEALTH_WEIGHT * ( elapsed - health[ "latency" ] )
+
+	def __expire( self, uuid: str, now: float ) -> None:
+
+		sent = self._sent.get( uuid )
+
+		if sent is None or now - sent[ 0 ] < GROUP_ACK_TIMEOUT: return
+
+		del self._sent[ uuid ]
+
+		self.__observe( uuid, False )
+
+	@callback
+	def async_bind( self, uuid: str, members: list[ str ], strategy: str ) -> bool:
+
+		device = self._devices.get( uuid )
+
+		if not isinstance( device, dict ) or not isinstance( device.get( "uuid" ), str ): return False
+
+		uuid = device[ "uuid" ]
+
+		self.__unbind( uuid )
+
+		members = [ member for member in dict.fromkeys( members ) if member != uuid ]
+
+		if members:
+
+			device[ "members"  ] = members
+			device[ "strategy" ] = strategy
+
+			for member in members:
+
+				self._groups.setdefault( member, set() ).add( uuid )
+
+		self.schedule_cache_dumps( uuid )
+
+		return True
+
+	def __unbind( self, uuid: str ) -> None:
+
+		device = self._cache.get( uuid )
+
+		if device is None: return
+
+		for member in device.pop( "members", [] ):
+
+			primaries = self._groups.get( member )
+
+			if primaries is None: continue
+
+			primaries.discard( uuid )
+
+			if not primaries: del self._groups[ member ]
+
+		device.pop( "strategy", None )
 
 	async def async_command( self, uuid: str, cmnd: str, payload: mqtt.PublishPayloadType, qos: int | None = None, retain: bool | None = None ) -> None:
 
@@ -119,14 +384,43 @@ class MQTTClient:
 
 		if not isinstance( topic, str ): return
 
-		await mqtt.async_publish( self.hass, f"cmnd/{topic}/{cmnd}", payload, qos, retain )
+		await self.async_publish( f"cmnd/{topic}/{cmnd}", payload, qos, retain )
 
 	async def async_publish( self, topic: str, payload: mqtt.PublishPayloadType, qos: int | None = None, retain: bool | None = None ) -> None:
 
+		self.stats[ "publish" ] += 1
+
 		await mqtt.async_publish( self.hass, topic, payload, qos, retain )
 
 	async def async_shutdown( self ) -> bool:
 
+		self._poller.async_stop()
+
+		if self._ingest_unsub is not None:
+
+			self._ingest_unsub()
+
+			self._ingest_unsub = None
+
+		self._ingest.clear()
+		self._ingest_lwt.clear()
+
+		await self.tasks.async_shutdown()
+
+		self._cache = {}
+
+		self._devices.clear()
+		self._lwt.clear()
+		self._pending.clear()
+		self._telemetry.clear()
+		self._heard.clear()
+		self._sent.clear()
+		self._latency.clear()
+		self._health.clear()
+		self._groups.clear()
+		self._stale.clear()
+		self._created.clear()
+
 		if self._sub_state:
 
 			_LOGGING.warning( "MQTT Unsubscribe Topics" )
@@ -141,6 +435,146 @@ class MQTTClient:
 
 		return self._devices.get( uuid )
 
+	def supported_models( self ) -> frozenset[ str ]:
+
+		raw = self.entry.options.get( CONF_MODELS, DEFAULT_MODELS )
+
+		if raw != self._models_raw:
+
+			self._models_raw = raw
+
+			self._models = frozenset( model.strip() for model in raw.split( "," ) if model.strip() )
+
+			self._models_bytes = tuple( model.encode() for model in self._models )
+
+		return self._models
+
+	def device_uuids( self ) -> list[ str ]:
+
+		return list( self._cache )
+
+	def last_heard( self, uuid ) -> float | None:
+
+		return self._heard.get( uuid )
+
+	def mark_stale( self, uuid ) -> None:
+
+		if uuid in self._stale: return
+
+		self._stale.add( uuid )
+
+		_LOGGING.info( f"Device {uuid} State Stale" )
+
+		async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "STALE", True )
+
+	def is_stale( self, uuid ) -> bool:
+
+		return uuid in self._stale
+
+	def __acknowledge( self, uuid ) -> str | None:
+
+		sent = self._sent.pop( uuid, None )
+
+		if sent is None: return None
+
+		elapsed = time.monotonic() - sent[ 0 ]
+
+		latency = self._latency.setdefault( uuid, { "count": 0, "total": 0.0, "max": 0.0, "last": 0.0 } )
+
+		latency[ "count" ] += 1
+		latency[ "total" ] += elapsed
+		latency[ "last"  ] = elapsed
+
+		if elapsed > latency[ "max" ]: latency[ "max" ] = elapsed
+
+		self.__observe( uuid, True, elapsed )
+
+		return sent[ 1 ]
+
+	def diagnostics( self ) -> dict:
+
+		return {
+			"devices": len( self._cache ),
+			"indexes": {
+				"devices":   len( self._devices ),
+				"cache":     len( self._cache ),
+				"lwt":       len( self._lwt ),
+				"telemetry": len( self._telemetry ),
+				"heard":     len( self._heard ),
+				"stale":     len( self._stale ),
+				"groups":    len( self._groups ),
+				"created":   len( self._created ),
+			},
+			"queued_commands": len( self._pending ),
+			"awaiting_ack":    len( self._sent ),
+			"ingest":          { "discovery": len( self._ingest ), "lwt": len( self._ingest_lwt ) },
+			"tasks":           dict( self.tasks.stats ),
+			"stats":           dict( self.stats ),
+		}
+
+	def device_diagnostics( self, uuid ) -> dict:
+
+		device = self._devices.get( uuid )
+
+		if not isinstance( device, dict ): return {}
+
+		now = time.monotonic()
+
+		heard = self._heard.get( uuid )
+
+		latency = self._latency.get( uuid )
+
+		health = self._health.get( uuid )
+
+		return {
+			"device":           device,
+			"last_message_age": None if heard is None else round( now - heard, 3 ),
+			"stale":            uuid in self._stale,
+			"queued_command":   uuid in self._pending,
+			"telemetry":        self._telemetry.get( uuid, {} ),
+			"latency":          None if latency is None else {
+				"count": latency[ "count" ],
+				"avg":   round( latency[ "total" ] / latency[ "count" ], 3 ),
+				"max":   round( latency[ "max" ], 3 ),
+				"last":  round( latency[ "last" ], 3 ),
+			},
+			"health":           None if health is None or health[ "ack" ] is None else {
+				"ack":     round( health[ "ack" ], 3 ),
+				"latency": None if health[ "latency" ] is None else round( health[ "latency" ], 3 ),
+			},
+		}
+
+	def __touch( self, uuid ) -> None:
+
+		self._heard[ uuid ] = time.monotonic()
+
+		if uuid in self._stale:
+
+			self._stale.discard( uuid )
+
+			async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "STALE", False )
+
+	def find_telemetry( self, uuid, name: str ):
+
+		return self._telemetry.get( uuid, {} ).get( name )
+
+	@staticmethod
+	def parse_temperature( payload ) -> float | None:
+
+		if not isinstance( payload, dict ): return None
+
+		for value in payload.values():
+
+			if isinstance( value, dict ) and isinstance( value.get( "Temperature" ), ( int, float ) ):
+
+				temp = float( value[ "Temperature" ] )
+
+				if payload.get( "TempUnit" ) == "F": temp = ( temp - 32.0 ) * 5.0 / 9.0
+
+				return round( temp, 1 )
+
+		return None
+
 	def remove_device( self, uuid ):
 
 		device = self._devices.get( uuid )
@@ -150,18 +584,131 @@ class MQTTClient:
 		uuid = device[ "uuid"  ]
 		name = device[ "topic" ]
 
-		self.hass.async_create_task( self.async_command( uuid, "Reset", "1" ) )
+		self.tasks.async_submit( "publish", ( uuid, "Reset" ), lambda: self.async_publish( f"cmnd/{name}/Reset", "1" ) )
+
+		self.tasks.async_submit( "publish", ( uuid, "discovery" ), lambda: self.async_publish( f"tasmota/discovery/{uuid}/config", None, None, True ) )
+
+		self.__forget( uuid, name )
+
+		self.schedule_cache_dumps( uuid )
+
+		return True
+
+	async def async_remove_devices( self, uuids: list[ str ], concurrency: int = REMOVE_DEVICES_CONCURRENCY ) -> dict:
+
+		result = { "removed": [], "failed": [], "unknown": [] }
+
+		devices = {}
+
+		for uuid in uuids:
+
+			device = self._devices.get( uuid )
+
+			if not isinstance( device, dict ) or not isinstance( device.get( "uuid" ), str ):
+
+				result[ "unknown" ].append( uuid )
+
+				continue
+
+			devices[ device[ "uuid" ] ] = device
+
+		if not devices: return result
+
+		semaphore = asyncio.Semaphore( max( 1, concurrency ) )
 
-		self.hass.async_create_task( self.async_publish( f"tasmota/discovery/{uuid}/config", None, None, True ) )
+		async def publish( uuid ):
+
+			async with semaphore:
+
+				await asyncio.gather(
+					self.async_command( uuid, "Reset", "1" ),
+					self.async_publish( f"tasmota/discovery/{uuid}/config", None, None, True ),
+				)
+
+		outcomes = await asyncio.gather( *[ publish( uuid ) for uuid in devices ], return_exceptions = True )
+
+		for ( uuid, device ), outcome in zip( devices.items(), outcomes ):
+
+			if isinstance( outcome, Exception ):
+
+				_LOGGING.warning( f"Device Remove {uuid} Failed: {outcome}" )
+
+				result[ "failed" ].append( uuid )
+
+				continue
+
+			self.__forget( uuid, device.get( "topic" ) )
+
+			self.schedule_cache_dumps( uuid )
+
+			result[ "removed" ].append( uuid )
+
+		if result[ "removed" ]: await self._journal.async_flush()
+
+		return result
+
+	def __forget( self, uuid: str, topic: str ) -> None:
+
+		self.__clear_shadow( uuid )
+
+		self.__unbind( uuid )
+
+		for primary in self._groups.pop( uuid, () ):
+
+			device = self._cache.get( primary )
+
+			if device is None or uuid not in device.get( "members", [] ): continue
+
+			device[ "members" ].remove( uuid )
+
+			self.schedule_cache_dumps( primary )
 
 		self._cache.pop( uuid, None )
+		self._pending.pop( uuid, None )
+		self._telemetry.pop( uuid, None )
+		self._heard.pop( uuid, None )
+		self._sent.pop( uuid, None )
+		self._latency.pop( uuid, None )
+		self._health.pop( uuid, None )
+		self._stale.discard( uuid )
+		self._created.discard( uuid )
+		self._ingest.pop( uuid, None )
+		self._ingest_lwt.pop( uuid, None )
 
 		self._devices.pop( uuid, None )
-		self._devices.pop( name, None )
+		self._devices.pop( topic, None )
 
-		self.hass.async_create_task( self.async_cache_dumps() )
+	@callback
+	def __close_runtime( self ) -> None:
 
-		return True
+		for uuid, device in self._cache.items():
+
+			if not runtime_running( device ): continue
+
+			runtime_transition( device, None )
+
+			self.schedule_cache_dumps( uuid )
+
+	def __timed( self, name: str, handler ):
+
+		@callback
+		def wrapper( msg: mqtt.ReceivePayloadType ) -> None:
+
+			start = time.perf_counter()
+
+			try:
+				handler( msg )
+
+			finally:
+				elapsed = time.perf_counter() - start
+
+				self.stats[ name ] += 1
+
+				self.stats[ "busy" ] += elapsed
+
+				if self._profiler.active: self._profiler.record( f"mqtt.{name}", elapsed )
+
+		return wrapper
 
 	async def _subscribe_topics( self, sub_state, topics ):
 
@@ -171,29 +718,94 @@ class MQTTClient:
 
 		return prepared_sub_state
 
-	async def __async_device_create( self, conf: dict ):
+	@callback
+	def __schedule_ingest( self ) -> None:
+
+		if len( self._ingest ) + len( self._ingest_lwt ) >= INGEST_BATCH_MAX:
+
+			self.__async_ingest()
+
+		elif self._ingest_unsub is None:
+
+			self._ingest_unsub = async_call_later( self.hass, INGEST_WINDOW, self.__async_ingest )
+
+	@callback
+	def __async_ingest( self, _now = None ) -> None:
+
+		if self._ingest_unsub is not None:
+
+			self._ingest_unsub()
+
+			self._ingest_unsub = None
+
+		confs = list( self._ingest.values() )
+
+		lwts = self._ingest_lwt
+
+		self._ingest = {}
+
+		self._ingest_lwt = {}
+
+		_LOGGING.debug( f"Ingest {len( confs )} Discovery, {len( lwts )} LWT" )
 
 		device_registry = dr.async_get( self.hass )
 
-		device_registry.async_get_or_create(
-			config_entry_id   = self.entry.entry_id,
-			configuration_url = f"http://{conf.get( 'ip' )}/",
-			connections       = { ( dr.CONNECTION_NETWORK_MAC, conf.get( "mac" ) ) },
-			identifiers       = { ( DOMAIN, conf.get( "mac" ) ) },
-			manufacturer      = "Zbeacon",
-			model             = conf.get( "md" ),
-			name              = conf.get( "hn" ),
-			sw_version        = conf.get( "sw" ),
-		)
+		for conf in confs:
+
+			device_registry.async_get_or_create(
+				config_entry_id   = self.entry.entry_id,
+				configuration_url = f"http://{conf.get( 'ip' )}/",
+				connections       = { ( dr.CONNECTION_NETWORK_MAC, conf.get( "mac" ) ) },
+				identifiers       = { ( DOMAIN, conf.get( "mac" ) ) },
+				manufacturer      = "Zbeacon",
+				model             = conf.get( "md" ),
+				name              = conf.get( "hn" ),
+				sw_version        = conf.get( "sw" ),
+			)
+
+		confs = [ conf for conf in confs if conf.get( "mac" ) not in self._created ]
+
+		if confs:
+
+			self._created.update( conf.get( "mac" ) for conf in confs )
+
+			async_dispatcher_send( self.hass, ZBEACON_IR_EVENT_DEVICE_NEW, confs )
+
+		for uuid, payload in lwts.items():
+
+			self.__async_lwt_changed( uuid, payload )
+
+	@callback
+	def __async_lwt_changed( self, uuid: str, payload ) -> None:
+
+		if payload == "Online":
+
+			for primary in ( uuid, *self._groups.get( uuid, () ) ):
+
+				if primary in self._pending:
+
+					self.tasks.async_submit( "irhvac", primary, lambda primary = primary: self.async_flush_irhvac( primary ) )
 
-		async_dispatcher_send( self.hass, ZBEACON_IR_EVENT_DEVICE_NEW, conf )
+		async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "LWT", payload )
 
 	@callback
 	def __on_discovery( self, msg: mqtt.ReceivePayloadType ) -> None:
 
 		if not msg.payload: return
 
-		payload = json.loads( msg.payload )
+		models = self.supported_models()
+
+		if isinstance( msg.payload, bytes ):
+
+			if not any( model in msg.payload for model in self._models_bytes ): return
+
+		elif not any( model in msg.payload for model in models ): return
+
+		try:
+			payload = json.loads( msg.payload )
+
+		except ValueError:
+			return
 
 		if not isinstance( payload, dict ): return
 
@@ -201,7 +813,7 @@ class MQTTClient:
 		topic = payload.get( "t"    )
 		model = payload.get( "md"   )
 
-		if ( uuid is None ) or ( topic is None ) or ( model is None ) or model != "Athom lR Remote": return
+		if ( uuid is None ) or ( topic is None ) or ( model is None ) or model not in models: return
 
 		device = self._cache.get( uuid )
 
@@ -209,7 +821,7 @@ class MQTTClient:
 
 			_LOGGING.info( f"Device Discovery {uuid}" )
 
-			status = self._devices.get( topic, {} ).get( "LWT" )
+			status = self._lwt.pop( topic, None )
 
 			device = { "uuid": uuid, "topic": topic, "LWT": status }
 
@@ -218,9 +830,11 @@ class MQTTClient:
 			self._devices[ uuid  ] = device
 			self._devices[ topic ] = device
 
-			self.hass.async_create_task( self.async_cache_dumps() )
+			self.schedule_cache_dumps( uuid )
+
+		self._ingest[ uuid ] = payload
 
-		self.hass.async_create_task( self.__async_device_create( payload ) )
+		self.__schedule_ingest()
 
 	@callback
 	def __on_tasmota_stat( self, msg: mqtt.ReceivePayloadType ) -> None:
@@ -245,18 +859,96 @@ class MQTTClient:
 
 		uuid = device.get( "uuid" )
 
+		self.__touch( uuid )
+
 		if topic[ 2 ] == "RESULT" and isinstance( payload, dict ):
 
+			if "UptimeSec" in payload:
+
+				self._telemetry.setdefault( uuid, {} )[ "STATE" ] = payload
+
+				async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "STATE", payload )
+
+				return
+
 			irhvac = payload.get( "IRHVAC" )
 
 			if not isinstance( irhvac, dict ): return
 
+			# A member blaster echoes the command of its primary, that is not its own AC state
+
+			primary = self.__acknowledge( uuid )
+
+			if primary is not None and primary != uuid: return
+
 			device[ "irhvac" ] = irhvac
 
-			self.hass.async_create_task( self.async_cache_dumps() )
+			self.schedule_cache_dumps( uuid )
+
+			self.__publish_shadow( device, "reported", irhvac )
 
 			async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "SET", irhvac )
 
+	@callback
+	def __on_shadow( self, msg: mqtt.ReceivePayloadType ) -> None:
+
+		if not msg.payload: return
+
+		try:
+			uuid, kind = msg.topic.split( '/' )[ -2: ]
+
+			payload = json.loads( msg.payload )
+
+		except ValueError:
+			return
+
+		if not isinstance( payload, dict ) or not isinstance( payload.get( "irhvac" ), dict ) or not isinstance( payload.get( "topic" ), str ): return
+
+		device = self._cache.get( uuid )
+
+		if device is None:
+
+			_LOGGING.info( f"Device Shadow {uuid}" )
+
+			topic = payload[ "topic" ]
+
+			device = { "uuid": uuid, "topic": topic, "LWT": self._lwt.pop( topic, None ) }
+
+			self._cache[ uuid ] = device
+
+			self._devices[ uuid  ] = device
+			self._devices[ topic ] = device
+
+		if kind != "reported" and "irhvac" in device: return
+
+		if device.get( "irhvac" ) == payload[ "irhvac" ]: return
+
+		device[ "irhvac" ] = payload[ "irhvac" ]
+
+		self.schedule_cache_dumps( uuid )
+
+		async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "SET", device[ "irhvac" ] )
+
+	@callback
+	def __publish_shadow( self, device: dict, kind: str, irhvac: dict ) -> None:
+
+		if not self._shadow: return
+
+		uuid = device[ "uuid" ]
+
+		payload = json.dumps( { "topic": device[ "topic" ], "irhvac": irhvac } )
+
+		self.tasks.async_submit( "publish", ( uuid, kind ), lambda: self.async_publish( f"{self._shadow}/{uuid}/{kind}", payload, 1, True ) )
+
+	@callback
+	def __clear_shadow( self, uuid: str ) -> None:
+
+		if not self._shadow: return
+
+		for kind in ( "desired", "reported" ):
+
+			self.tasks.async_submit( "publish", ( uuid, kind ), lambda kind = kind: self.async_publish( f"{self._shadow}/{uuid}/{kind}", None, 1, True ) )
+
 	@callback
 	def __on_tasmota_tele( self, msg: mqtt.ReceivePayloadType ) -> None:
 
@@ -276,27 +968,39 @@ class MQTTClient:
 
 		if not isinstance( device, dict ):
 
-			if topic[ 2 ] == "LWT":
+			if topic[ 2 ] == "LWT" and isinstance( payload, str ):
 
-				self._devices[ topic[ 1 ] ] = { "LWT": payload }
+				self._lwt[ topic[ 1 ] ] = sys.intern( payload )
 
 			return
 
 		uuid = device.get( "uuid" )
 
+		if topic[ 2 ] != "LWT" or payload == "Online":
+
+			self.__touch( uuid )
+
 		if topic[ 2 ] == "LWT":
 
-			if not isinstance( uuid, str ):
+			if device[ "LWT" ] != payload:
+
+				device[ "LWT" ] = sys.intern( payload ) if isinstance( payload, str ) else payload
+
+				self.schedule_cache_dumps( uuid )
+
+				if self._ingest_unsub is not None:
 
-				device[ "LWT" ] = payload
+					self._ingest_lwt[ uuid ] = payload
 
-			elif device[ "LWT" ] != payload:
+					self.__schedule_ingest()
+				else:
+					self.__async_lwt_changed( uuid, payload )
 
-				device[ "LWT" ] = payload
+		elif ( topic[ 2 ] == "STATE" or topic[ 2 ] == "SENSOR" ) and isinstance( payload, dict ):
 
-				self.hass.async_create_task( self.async_cache_dumps() )
+			self._telemetry.setdefault( uuid, {} )[ topic[ 2 ] ] = payload
 
-				async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "LWT", payload )
+			async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", topic[ 2 ], payload )
 
 		elif topic[ 2 ] == "RESULT" and isinstance( payload, dict ):
 
@@ -316,8 +1020,8 @@ class MQTTClient:
 
 			device[ "irhvac" ] = irhvac
 
-			self.hass.async_create_task( self.async_cache_dumps() )
+			self.schedule_cache_dumps( uuid )
 
-			self.hass.async_create_task( self.async_cmnd_irhvac( uuid ) )
+			self.tasks.async_submit( "irhvac", uuid, lambda: self.async_cmnd_irhvac( uuid ) )
 
 			async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "SET", irhvac )
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import time
+import random
+import logging
+
+from collections import deque
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+	CONF_POLL_INTERVAL,
+	DEFAULT_POLL_INTERVAL,
+	POLL_JITTER,
+	POLL_TICK,
+	POLL_TICK_BUDGET,
+)
+
+_LOGGING = logging.getLogger( __name__ )
+
+class ReconcilePoller:
+
+	def __init__( self, hass: HomeAssistant, client ):
+
+		self.hass   = hass
+		self.client = client
+
+		self._queue = deque()
+
+		self._round = None
+
+		self._credit = 0.0
+
+		self._started = time.monotonic()
+
+		self._unsub = None
+
+	@property
+	def _period( self ) -> float:
+
+		return self.client.entry.options.get( CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL )
+
+	@callback
+	def async_start( self ) -> None:
+
+		if self._unsub is not None: return
+
+		self._started = time.monotonic()
+
+		self.__schedule()
+
+	@callback
+	def async_stop( self ) -> None:
+
+		if self._unsub is not None:
+
+			self._unsub()
+
+			self._unsub = None
+
+		self._queue.clear()
+
+		self._credit = 0.0
+
+	def __schedule( self ) -> None:
+
+		delay = POLL_TICK * random.uniform( 1.0 - POLL_JITTER, 1.0 + POLL_JITTER )
+
+		self._unsub = async_call_later( self.hass, delay, self.__async_tick )
+
+	@callback
+	def __async_tick( self, _now ) -> None:
+
+		self._unsub = None
+
+		now = time.monotonic()
+
+		if self._period <= 0:
+
+			self._queue.clear()
+
+			self._round = None
+
+			self._credit = 0.0
+
+			self.__schedule()
+
+			return
+
+		if not self._queue and ( self._round is None or now - self._round >= self._period ):
+
+			self._round = now
+
+			self._queue.extend( self.client.device_uuids() )
+
+		if not self._queue:
+
+			self._credit = 0.0
+
+			self.__schedule()
+
+			return
+
+		self._credit = min( POLL_TICK_BUDGET, self._credit + len( self._queue ) * POLL_TICK / max( POLL_TICK, self._period - ( now - self._round ) ) )
+
+		budget = int( self._credit )
+
+		self._credit -= budget
+
+		while budget > 0 and self._queue:
+
+			uuid = self._queue.popleft()
+
+			device = self.client.find_device( uuid )
+
+			if not isinstance( device, dict ): continue
+
+			heard = self.client.last_heard( uuid )
+
+			if now - ( heard or self._started ) > 2 * self._period:
+
+				self.client.mark_stale( uuid )
+
+			if device.get( "LWT" ) != "Online": continue
+
+			if heard is not None and now - heard < self._period: continue
+
+			# Tasmota answers STATE with liveness and Wi-Fi data only, there is no way to read
+			# back the AC state, so this confirms the blaster is alive rather than the irhvac
+
+			self.client.tasks.async_submit( "poll", uuid, lambda uuid = uuid: self.client.async_command( uuid, "STATE", "" ) )
+
+			budget -= 1
+
+		self.__schedule()
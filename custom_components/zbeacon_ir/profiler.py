@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+import functools
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+PROFILER = f"{DOMAIN}_profiler"
+
+class CallProfiler:
+
+	def __init__( self ):
+
+		self.active = False
+
+		self._calls = {}
+
+	@callback
+	def async_start( self ) -> None:
+
+		self._calls = {}
+
+		self.active = True
+
+	@callback
+	def async_stop( self ) -> dict:
+
+		self.active = False
+
+		calls, self._calls = self._calls, {}
+
+		return calls
+
+	@callback
+	def record( self, name: str, elapsed: float ) -> None:
+
+		call = self._calls.get( name )
+
+		if call is None: call = self._calls[ name ] = { "calls": 0, "total": 0.0, "max": 0.0 }
+
+		call[ "calls" ] += 1
+		call[ "total" ] += elapsed
+
+		if elapsed > call[ "max" ]: call[ "max" ] = elapsed
+
+@callback
+def async_get_profiler( hass: HomeAssistant ) -> CallProfiler:
+
+	profiler = hass.data.get( PROFILER )
+
+	if profiler is None: profiler = hass.data[ PROFILER ] = CallProfiler()
+
+	return profiler
+
+def profiled( name: str ):
+
+	def decorator( handler ):
+
+		@functools.wraps( handler )
+		async def wrapper( self, *args, **kwargs ):
+
+			profiler = self.hass.data.get( PROFILER )
+
+			if profiler is None or not profiler.active: return await handler( self, *args, **kwargs )
+
+			start = time.perf_counter()
+
+			try:
+				return await handler( self, *args, **kwargs )
+
+			finally:
+				profiler.record( name, time.perf_counter() - start )
+
+		return wrapper
+
+	return decorator
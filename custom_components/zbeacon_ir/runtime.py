@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+import time
+
+from .const import RUNTIME_BAND
+
+def runtime_band( temp ) -> str | None:
+
+	if not isinstance( temp, ( int, float ) ): return None
+
+	low = int( math.floor( temp / RUNTIME_BAND ) * RUNTIME_BAND )
+
+	return f"{low}-{low + RUNTIME_BAND}"
+
+def runtime_reset( device: dict ) -> None:
+
+	runtime = device.get( "runtime" )
+
+	if isinstance( runtime, dict ): runtime[ "state" ] = None
+
+def runtime_running( device: dict, mode: str | None = None ) -> bool:
+
+	runtime = device.get( "runtime" )
+
+	if not isinstance( runtime, dict ) or runtime[ "state" ] is None: return False
+
+	return mode is None or runtime[ "state" ][ 0 ] == mode
+
+def runtime_transition( device: dict, mode: str | None, temp = None ) -> bool:
+
+	now = time.time()
+
+	runtime = device.setdefault( "runtime", { "mode": {}, "band": {}, "state": None, "since": now } )
+
+	state = runtime[ "state" ]
+
+	if mode == "off": mode = None
+
+	new = None if mode is None else [ mode, runtime_band( temp ) ]
+
+	if state == new: return False
+
+	if state is not None:
+
+		elapsed = max( 0.0, now - runtime[ "since" ] )
+
+		runtime[ "mode" ][ state[ 0 ] ] = runtime[ "mode" ].get( state[ 0 ], 0.0 ) + elapsed
+
+		if state[ 1 ] is not None:
+
+			runtime[ "band" ][ state[ 1 ] ] = runtime[ "band" ].get( state[ 1 ], 0.0 ) + elapsed
+
+	runtime[ "state" ] = new
+	runtime[ "since" ] = now
+
+	return True
+
+def runtime_value( device: dict, mode: str | None = None ) -> float:
+
+	runtime = device.get( "runtime" )
+
+	if not isinstance( runtime, dict ): return 0.0
+
+	if mode is None:
+
+		total = sum( runtime[ "mode" ].values() )
+	else:
+		total = runtime[ "mode" ].get( mode, 0.0 )
+
+	state = runtime[ "state" ]
+
+	if state is not None and ( mode is None or state[ 0 ] == mode ):
+
+		total += max( 0.0, time.time() - runtime[ "since" ] )
+
+	return total
+
+def runtime_bands( device: dict ) -> dict:
+
+	runtime = device.get( "runtime" )
+
+	if not isinstance( runtime, dict ): return {}
+
+	bands = dict( runtime[ "band" ] )
+
+	state = runtime[ "state" ]
+
+	if state is not None and state[ 1 ] is not None:
+
+		bands[ state[ 1 ] ] = bands.get( state[ 1 ], 0.0 ) + max( 0.0, time.time() - runtime[ "since" ] )
+
+	return bands
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import heapq
+import asyncio
+import logging
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+	DOMAIN,
+	SCHEDULE_CONCURRENCY,
+	SCHEDULE_SPACING,
+	STORE_SAVE_DELAY,
+	ZBEACON_IR_EVENT_DEVICE_MSG,
+)
+
+_LOGGING = logging.getLogger( __name__ )
+
+HVAC_MODE_IRHVAC = {
+	"off":      ( "Off", "Off"  ),
+	"auto":     ( "On",  "Auto" ),
+	"cool":     ( "On",  "Cool" ),
+	"heat":     ( "On",  "Heat" ),
+	"dry":      ( "On",  "Dry"  ),
+	"fan_only": ( "On",  "Fan"  ),
+}
+
+def schedule_error( schedule: dict, capability ) -> str | None:
+
+	if schedule.get( "hvac_mode" ) is not None and schedule[ "hvac_mode" ] not in capability.hvac_modes:
+
+		return f"HVAC mode {schedule[ 'hvac_mode' ]} is not supported"
+
+	if schedule.get( "temperature" ) is not None and not capability.min_temp <= schedule[ "temperature" ] <= capability.max_temp:
+
+		return f"Temperature {schedule[ 'temperature' ]} is out of range"
+
+	if schedule.get( "fan_mode" ) is not None and schedule[ "fan_mode" ] not in capability.fan_modes:
+
+		return f"Fan mode {schedule[ 'fan_mode' ]} is not supported"
+
+	return None
+
+def schedule_store( hass: HomeAssistant, entry: ConfigEntry ) -> Store:
+
+	return Store( hass, 1, f"{DOMAIN}_{entry.entry_id}_schedules" )
+
+class ScheduleEngine:
+
+	def __init__( self, hass: HomeAssistant, entry: ConfigEntry, client ):
+
+		self.hass   = hass
+		self.entry  = entry
+		self.client = client
+
+		self._store = schedule_store( hass, entry )
+
+		self._schedules = {}
+
+		self._heap = []
+
+		self._versions = {}
+
+		self._seq = 0
+
+		self._unsub = None
+
+		self._dirty = False
+
+		self._semaphore = asyncio.Semaphore( SCHEDULE_CONCURRENCY )
+
+	async def async_init( self ) -> None:
+
+		self._schedules = await self._store.async_load() or {}
+
+		_LOGGING.info( f"Load {len( self._schedules )} Schedules" )
+
+		now = dt_util.now()
+
+		for schedule_id in self._schedules:
+
+			self.__push( schedule_id, now )
+
+		self.__arm()
+
+		self.entry.async_on_unload( self.async_shutdown )
+
+	async def async_shutdown( self ) -> None:
+
+		if self._unsub is not None:
+
+			self._unsub()
+
+			self._unsub = None
+
+		self._heap.clear()
+
+		if self._dirty:
+
+			self._dirty = False
+
+			await self._store.async_save( self._schedules )
+
+	@callback
+	def async_set( self, schedule_id: str, schedule: dict ) -> None:
+
+		self._schedules[ schedule_id ] = schedule
+
+		self.__push( schedule_id, dt_util.now() )
+
+		self.__arm()
+
+		self._dirty = True
+
+		self._store.async_delay_save( lambda: self._schedules, STORE_SAVE_DELAY )
+
+	@callback
+	def async_delete( self, schedule_id: str ) -> bool:
+
+		if self._schedules.pop( schedule_id, None ) is None: return False
+
+		self._versions.pop( schedule_id, None )
+
+		self._dirty = True
+
+		self._store.async_delay_save( lambda: self._schedules, STORE_SAVE_DELAY )
+
+		return True
+
+	def validate( self, schedule: dict ) -> dict[ str, str ]:
+
+		errors = {}
+
+		for uuid in schedule.get( "mac", [] ):
+
+			device = self.client.find_device( uuid )
+
+			irhvac = device.get( "irhvac" ) if isinstance( device, dict ) else None
+
+			if not isinstance( irhvac, dict ): continue
+
+			error = schedule_error( schedule, self.__capability( irhvac ) )
+
+			if error is not None: errors[ uuid ] = f"{error} by {irhvac.get( 'Vendor' )}"
+
+		return errors
+
+	def __capability( self, irhvac: dict ):
+
+		return self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "capabilities" ].get( irhvac.get( "Vendor" ) )
+
+	def schedules( self ) -> dict:
+
+		return self._schedules
+
+	@staticmethod
+	def next_run( schedule: dict, now: datetime ) -> datetime | None:
+
+		hour, minute = ( int( v ) for v in schedule[ "time" ].split( ":" )[ :2 ] )
+
+		weekdays = schedule.get( "weekdays" ) or list( range( 7 ) )
+
+		base = now.replace( hour = hour, minute = minute, second = 0, microsecond = 0 )
+
+		for offset in range( 8 ):
+
+			candidate = base + timedelta( days = offset )
+
+			if candidate > now and candidate.weekday() in weekdays: return candidate
+
+		return None
+
+	def __push( self, schedule_id: str, now: datetime ) -> None:
+
+		when = self.next_run( self._schedules[ schedule_id ], now )
+
+		if when is None: return
+
+		self._seq += 1
+
+		self._versions[ schedule_id ] = self._seq
+
+		heapq.heappush( self._heap, ( when.timestamp(), self._seq, schedule_id, self._seq ) )
+
+	def __arm( self ) -> None:
+
+		while self._heap and self._versions.get( self._heap[ 0 ][ 2 ] ) != self._heap[ 0 ][ 3 ]:
+
+			heapq.heappop( self._heap )
+
+		if self._unsub is not None:
+
+			self._unsub()
+
+			self._unsub = None
+
+		if not self._heap: return
+
+		when = dt_util.utc_from_timestamp( self._heap[ 0 ][ 0 ] )
+
+		self._unsub = async_track_point_in_utc_time( self.hass, self.__async_wakeup, when )
+
+	@callback
+	def __async_wakeup( self, _now ) -> None:
+
+		self._unsub = None
+
+		now = dt_util.now()
+
+		actions = {}
+
+		while self._heap and self._heap[ 0 ][ 0 ] <= now.timestamp():
+
+			_, _, schedule_id, version = heapq.heappop( self._heap )
+
+			if self._versions.get( schedule_id ) != version: continue
+
+			schedule = self._schedules[ schedule_id ]
+
+			for uuid in schedule.get( "mac", [] ):
+
+				actions[ uuid ] = schedule
+
+			self.__push( schedule_id, now )
+
+		if actions:
+
+			_LOGGING.info( f"Run Schedules On {len( actions )} Devices" )
+
+			self.client.tasks.async_submit( "schedule", None, lambda: self.async_apply( actions ) )
+
+		self.__arm()
+
+	async def async_apply( self, actions: dict ) -> None:
+
+		async def apply( uuid, schedule ):
+
+			device = self.client.find_device( uuid )
+
+			if not isinstance( device, dict ): return
+
+			irhvac = device.get( "irhvac" )
+
+			if not isinstance( irhvac, dict ): return
+
+			error = schedule_error( schedule, self.__capability( irhvac ) )
+
+			if error is not None:
+
+				_LOGGING.warning( f"Schedule On {uuid} Skipped: {error} by {irhvac.get( 'Vendor' )}" )
+
+				return
+
+			if schedule.get( "hvac_mode" ) in HVAC_MODE_IRHVAC:
+
+				irhvac[ "Power" ], irhvac[ "Mode" ] = HVAC_MODE_IRHVAC[ schedule[ "hvac_mode" ] ]
+
+			if schedule.get( "temperature" ) is not None:
+
+				irhvac[ "Celsius" ] = "On"
+				irhvac[ "Temp"    ] = int( schedule[ "temperature" ] )
+
+			if schedule.get( "fan_mode" ) is not None:
+
+				irhvac[ "FanSpeed" ] = schedule[ "fan_mode" ]
+
+			async with self._semaphore:
+
+				await self.client.async_cmnd_irhvac( uuid )
+
+				await asyncio.sleep( SCHEDULE_SPACING )
+
+			async_dispatcher_send( self.hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}", "SET", irhvac )
+
+		outcomes = await asyncio.gather( *[ apply( uuid, schedule ) for uuid, schedule in actions.items() ], return_exceptions = True )
+
+		for uuid, outcome in zip( actions, outcomes ):
+
+			if isinstance( outcome, Exception ): _LOGGING.warning( f"Schedule On {uuid} Failed: {outcome}" )
+
+			self.client.schedule_cache_dumps( uuid )
@@ -1,23 +1,34 @@
 from __future__ import annotations
 
+import time
 import logging
 
+from datetime import timedelta
+
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.const import UnitOfTime
+from homeassistant.components.climate import HVACMode
 
 from homeassistant.components.sensor import (
+	SensorDeviceClass,
 	SensorEntity,
+	SensorStateClass,
 )
 
 from .const import (
 	DOMAIN,
+	RUNTIME_REFRESH,
 	ZBEACON_IR_EVENT_DEVICE_NEW,
 	ZBEACON_IR_EVENT_DEVICE_MSG,
 )
+from .runtime import runtime_bands, runtime_running, runtime_value
+from .telemetry import TELEMETRY_SENSORS, TelemetrySensorEntityDescription, telemetry_should_write
 
 _LOGGING = logging.getLogger( __name__ )
 
@@ -25,20 +36,48 @@ async def async_setup_entry( hass: HomeAssistant, entry: ConfigEntry, async_add_
 
 	signal = hass.data[ DOMAIN ][ entry.entry_id ].setdefault( "signal", {} )
 
+	runtime = set()
+
+	@callback
+	def async_runtime_tick( _now ) -> None:
+
+		for sensor in runtime: sensor.async_refresh()
+
 	@callback
-	def async_discover( conf ):
+	def async_discover( confs ):
+
+		entities = []
+
+		for conf in confs:
+
+			uuid = conf.get( "mac" )
+
+			entities.extend( [
 
-		uuid = conf.get( "mac" )
+				CustomSensor( hass, entry, uuid, f"{uuid}_vendor", "sensor_vendor" ),
 
-		async_add_entities( [
+				*[ TelemetrySensor( hass, entry, uuid, description ) for description in TELEMETRY_SENSORS ],
 
-			CustomSensor( hass, entry, uuid, f"{uuid}_vendor", "sensor_vendor" )
-		] )
+				*[ RuntimeSensor( hass, entry, uuid, mode, runtime ) for mode in RUNTIME_MODES ],
+			] )
+
+		async_add_entities( entities )
 
 	signal[ "sensor" ] = async_dispatcher_connect( hass, ZBEACON_IR_EVENT_DEVICE_NEW, async_discover )
 
+	signal[ "sensor_runtime" ] = async_track_time_interval( hass, async_runtime_tick, timedelta( seconds = RUNTIME_REFRESH ) )
+
 	async_add_entities( [] )
 
+RUNTIME_MODES = (
+	None,
+	HVACMode.AUTO,
+	HVACMode.COOL,
+	HVACMode.HEAT,
+	HVACMode.DRY,
+	HVACMode.FAN_ONLY,
+)
+
 class CustomSensor( SensorEntity ):
 
 	_attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -116,3 +155,181 @@ class CustomSensor( SensorEntity ):
 					self._attr_native_value = irhvac[ "Vendor" ]
 
 					self.async_write_ha_state()
+
+class TelemetrySensor( SensorEntity ):
+
+	entity_description: TelemetrySensorEntityDescription
+
+	_attr_entity_category = EntityCategory.DIAGNOSTIC
+
+	_attr_entity_registry_enabled_default = False
+
+	_attr_has_entity_name = True
+
+	def __init__( self, hass: HomeAssistant, entry: ConfigEntry, uuid: str, description: TelemetrySensorEntityDescription ):
+
+		self.hass  = hass
+		self.entry = entry
+		self.uuid  = uuid
+
+		self.entity_description = description
+
+		self._attr_unique_id = f"{uuid}_{description.key}"
+
+		self._attr_available = False
+
+		self._written = None
+
+		self._attr_device_info = DeviceInfo(
+			connections = { ( CONNECTION_NETWORK_MAC, uuid ) },
+			identifiers = { ( DOMAIN, uuid ) },
+		)
+
+		mqtt = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+		conf = mqtt.find_device( uuid )
+
+		if isinstance( conf, dict ):
+
+			self._attr_available = ( conf[ "LWT" ] == "Online" )
+
+		payload = mqtt.find_telemetry( uuid, description.topic )
+
+		if payload is not None: self._attr_native_value = description.value_fn( payload )
+
+	async def async_added_to_hass( self ) -> None:
+
+		self._event_signal = async_dispatcher_connect(
+			self.hass,
+			f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{self.uuid}",
+			self.__async_device_event
+		)
+
+		_LOGGING.debug( f"async_added_to_hass( {self._attr_unique_id} )" )
+
+	async def async_will_remove_from_hass( self ) -> None:
+
+		if self._event_signal: self._event_signal()
+
+		_LOGGING.debug( f"async_will_remove_from_hass( {self._attr_unique_id} )" )
+
+	@callback
+	def __async_device_event( self, name: str, data ) -> None:
+
+		if name == "LWT":
+
+			self._attr_available = ( data == "Online" )
+
+			self.async_write_ha_state()
+
+		elif name == self.entity_description.topic:
+
+			value = self.entity_description.value_fn( data )
+
+			if value is None: return
+
+			now = time.monotonic()
+
+			if not telemetry_should_write( self.entity_description, value, self._attr_native_value, self._written, now ): return
+
+			self._attr_native_value = value
+
+			self._written = now
+
+			self.async_write_ha_state()
+
+class RuntimeSensor( SensorEntity ):
+
+	_attr_device_class = SensorDeviceClass.DURATION
+
+	_attr_has_entity_name = True
+
+	_attr_icon = "mdi:timer-outline"
+
+	_attr_native_unit_of_measurement = UnitOfTime.HOURS
+
+	_attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+	_attr_suggested_display_precision = 1
+
+	def __init__( self, hass: HomeAssistant, entry: ConfigEntry, uuid: str, mode: HVACMode | None, runtime: set ):
+
+		self.hass  = hass
+		self.entry = entry
+		self.uuid  = uuid
+		self.mode  = None if mode is None else str( mode )
+
+		self._runtime = runtime
+
+		key = "total" if mode is None else self.mode
+
+		self._attr_entity_registry_enabled_default = mode is None
+
+		self._attr_unique_id = f"{uuid}_runtime_{key}"
+
+		self.translation_key = f"sensor_runtime_{key}"
+
+		self._attr_device_info = DeviceInfo(
+			connections = { ( CONNECTION_NETWORK_MAC, uuid ) },
+			identifiers = { ( DOMAIN, uuid ) },
+		)
+
+		self.__update()
+
+	async def async_added_to_hass( self ) -> None:
+
+		self._event_signal = async_dispatcher_connect(
+			self.hass,
+			f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{self.uuid}",
+			self.__async_device_event
+		)
+
+		self._runtime.add( self )
+
+		_LOGGING.debug( f"async_added_to_hass( {self._attr_unique_id} )" )
+
+	async def async_will_remove_from_hass( self ) -> None:
+
+		if self._event_signal: self._event_signal()
+
+		self._runtime.discard( self )
+
+		_LOGGING.debug( f"async_will_remove_from_hass( {self._attr_unique_id} )" )
+
+	def __update( self ) -> None:
+
+		mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
+
+		conf = mqtt.find_device( self.uuid )
+
+		if not isinstance( conf, dict ): return
+
+		self._attr_native_value = round( runtime_value( conf, self.mode ) / 3600.0, 3 )
+
+		if self.mode is None:
+
+			self._attr_extra_state_attributes = {
+				f"{band} °C": round( seconds / 3600.0, 3 ) for band, seconds in runtime_bands( conf ).items()
+			}
+
+	@callback
+	def async_refresh( self ) -> None:
+
+		mqtt = self.hass.data[ DOMAIN ][ self.entry.entry_id ][ "mqtt" ]
+
+		conf = mqtt.find_device( self.uuid )
+
+		if not isinstance( conf, dict ) or not runtime_running( conf, self.mode ): return
+
+		self.__update()
+
+		self.async_write_ha_state()
+
+	@callback
+	def __async_device_event( self, name: str, data ) -> None:
+
+		if name == "RUNTIME" or name == "SET" or name == "LWT":
+
+			self.__update()
+
+			self.async_write_ha_state()
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.const import WEEKDAYS
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+	DOMAIN,
+	SERVICE_BIND_BLASTERS,
+	REMOVE_DEVICES_CONCURRENCY,
+	SERVICE_PROFILE,
+	SERVICE_REMOVE_DEVICES,
+	SERVICE_REMOVE_MACRO,
+	SERVICE_REMOVE_SCHEDULE,
+	SERVICE_RUN_MACRO,
+	SERVICE_SET_MACRO,
+	SERVICE_SET_SCHEDULE,
+)
+from .profiler import async_get_profiler
+from .schedule import HVAC_MODE_IRHVAC
+
+_LOGGING = logging.getLogger( __name__ )
+
+REMOVE_DEVICES_SCHEMA = vol.Schema( {
+	vol.Optional( "mac",         default = [] ): vol.All( cv.ensure_list, [ cv.string ] ),
+	vol.Optional( "area_id",     default = [] ): vol.All( cv.ensure_list, [ cv.string ] ),
+	vol.Optional( "concurrency", default = REMOVE_DEVICES_CONCURRENCY ): vol.All( vol.Coerce( int ), vol.Range( min = 1, max = 256 ) ),
+} )
+
+PROFILE_SCHEMA = vol.Schema( {
+	vol.Optional( "duration", default = 60 ): vol.All( vol.Coerce( float ), vol.Range( min = 1, max = 3600 ) ),
+	vol.Optional( "top",      default = 20 ): vol.All( vol.Coerce( int ), vol.Range( min = 1, max = 200 ) ),
+} )
+
+SET_SCHEDULE_SCHEMA = vol.Schema( {
+	vol.Required( "schedule_id" ): cv.string,
+	vol.Required( "mac" ): vol.All( cv.ensure_list, [ cv.string ] ),
+	vol.Required( "time" ): cv.time,
+	vol.Optional( "weekdays", default = [] ): vol.All( cv.ensure_list, [ vol.In( WEEKDAYS ) ] ),
+	vol.Optional( "hvac_mode" ): vol.In( list( HVAC_MODE_IRHVAC ) ),
+	vol.Optional( "temperature" ): vol.Coerce( float ),
+	vol.Optional( "fan_mode" ): cv.string,
+} )
+
+REMOVE_SCHEDULE_SCHEMA = vol.Schema( {
+	vol.Required( "schedule_id" ): cv.string,
+} )
+
+BIND_BLASTERS_SCHEMA = vol.Schema( {
+	vol.Required( "mac" ): cv.string,
+	vol.Optional( "members",  default = [] ): vol.All( cv.ensure_list, [ cv.string ] ),
+	vol.Optional( "strategy", default = "all" ): vol.In( [ "all", "best" ] ),
+} )
+
+MACRO_STEP_SCHEMA = vol.Schema( {
+	vol.Required( "mac" ): cv.string,
+	vol.Optional( "command", default = "IRHVAC" ): cv.string,
+	vol.Optional( "payload", default = "" ): vol.Any( dict, cv.string ),
+	vol.Optional( "delay",   default = 0.0 ): vol.All( vol.Coerce( float ), vol.Range( min = 0 ) ),
+} )
+
+SET_MACRO_SCHEMA = vol.Schema( {
+	vol.Required( "macro_id" ): cv.string,
+	vol.Required( "steps" ): vol.All( cv.ensure_list, [ MACRO_STEP_SCHEMA ] ),
+} )
+
+MACRO_SCHEMA = vol.Schema( {
+	vol.Required( "macro_id" ): cv.string,
+} )
+
+def _profile_dumps( calls: dict, path: str, top: int ) -> list[ dict ]:
+
+	with open( path, "w", encoding = "utf-8" ) as f:
+
+		for name, call in sorted( calls.items() ):
+
+			f.write( f"{DOMAIN};{name.replace( '.', ';' )} {int( call[ 'total' ] * 1000000 )}\n" )
+
+	rows = [
+		{
+			"function": name,
+			"calls":    call[ "calls" ],
+			"total":    round( call[ "total" ], 6 ),
+			"mean":     round( call[ "total" ] / call[ "calls" ], 6 ),
+			"max":      round( call[ "max" ], 6 ),
+		}
+		for name, call in calls.items()
+	]
+
+	rows.sort( key = lambda row: row[ "total" ], reverse = True )
+
+	return rows[ :top ]
+
+@callback
+def async_setup_services( hass: HomeAssistant ) -> None:
+
+	async def async_remove_devices( call: ServiceCall ) -> ServiceResponse:
+
+		dev_reg = dr.async_get( hass )
+
+		areas = set( call.data[ "area_id" ] )
+
+		result = { "removed": [], "failed": [], "unknown": [] }
+
+		resolved = set()
+
+		for entry_id, data in hass.data.get( DOMAIN, {} ).items():
+
+			mqtt = data.get( "mqtt" )
+
+			if mqtt is None: continue
+
+			targets = {}
+
+			for value in call.data[ "mac" ]:
+
+				device = mqtt.find_device( value )
+
+				if not isinstance( device, dict ) or not isinstance( device.get( "uuid" ), str ): continue
+
+				resolved.add( value )
+
+				uuid = device[ "uuid" ]
+
+				targets[ uuid ] = dev_reg.async_get_device( identifiers = { ( DOMAIN, uuid ) } )
+
+			for device_entry in dr.async_entries_for_config_entry( dev_reg, entry_id ):
+
+				if device_entry.area_id not in areas: continue
+
+				for domain, uuid in device_entry.identifiers:
+
+					if domain == DOMAIN: targets[ uuid ] = device_entry
+
+			if not targets: continue
+
+			_LOGGING.info( f"Remove {len( targets )} Devices" )
+
+			outcome = await mqtt.async_remove_devices( list( targets ), call.data[ "concurrency" ] )
+
+			for uuid in outcome[ "removed" ]:
+
+				device_entry = targets.get( uuid )
+
+				if device_entry is not None: dev_reg.async_remove_device( device_entry.id )
+
+			for key, value in outcome.items():
+
+				result[ key ].extend( value )
+
+		result[ "unknown" ].extend( value for value in call.data[ "mac" ] if value not in resolved )
+
+		return result
+
+	async def async_profile( call: ServiceCall ) -> ServiceResponse:
+
+		profiler = async_get_profiler( hass )
+
+		if profiler.active:
+
+			raise HomeAssistantError( "Profiler Already Running" )
+
+		_LOGGING.warning( f"Profile Start For {call.data[ 'duration' ]}s" )
+
+		profiler.async_start()
+
+		try:
+			await asyncio.sleep( call.data[ "duration" ] )
+
+		finally:
+			calls = profiler.async_stop()
+
+		path = hass.config.path( f"{DOMAIN}_profile_{int( time.time() )}.collapsed" )
+
+		top = await hass.async_add_executor_job( _profile_dumps, calls, path, call.data[ "top" ] )
+
+		_LOGGING.warning( f"Profile Saved {path}" )
+
+		return { "file": path, "top": top }
+
+	async def async_set_schedule( call: ServiceCall ) -> None:
+
+		schedule = {
+			"mac":         call.data[ "mac" ],
+			"time":        call.data[ "time" ].strftime( "%H:%M" ),
+			"weekdays":    [ WEEKDAYS.index( day ) for day in call.data[ "weekdays" ] ],
+			"hvac_mode":   call.data.get( "hvac_mode" ),
+			"temperature": call.data.get( "temperature" ),
+			"fan_mode":    call.data.get( "fan_mode" ),
+		}
+
+		engines = [ data[ "schedule" ] for data in hass.data.get( DOMAIN, {} ).values() if "schedule" in data ]
+
+		for engine in engines:
+
+			errors = engine.validate( schedule )
+
+			if errors:
+
+				raise ServiceValidationError( "; ".join( f"{uuid}: {error}" for uuid, error in errors.items() ) )
+
+		for engine in engines:
+
+			engine.async_set( call.data[ "schedule_id" ], schedule )
+
+	async def async_remove_schedule( call: ServiceCall ) -> None:
+
+		for data in hass.data.get( DOMAIN, {} ).values():
+
+			if "schedule" in data: data[ "schedule" ].async_delete( call.data[ "schedule_id" ] )
+
+	async def async_bind_blasters( call: ServiceCall ) -> None:
+
+		for data in hass.data.get( DOMAIN, {} ).values():
+
+			mqtt = data.get( "mqtt" )
+
+			if mqtt is None: continue
+
+			for member in call.data[ "members" ]:
+
+				if mqtt.find_device( member ) is None:
+
+					raise HomeAssistantError( f"Unknown Device {member}" )
+
+			if not mqtt.async_bind( call.data[ "mac" ], call.data[ "members" ], call.data[ "strategy" ] ):
+
+				raise HomeAssistantError( f"Unknown Device {call.data[ 'mac' ]}" )
+
+	async def async_set_macro( call: ServiceCall ) -> None:
+
+		for data in hass.data.get( DOMAIN, {} ).values():
+
+			if "macro" in data: data[ "macro" ].async_set( call.data[ "macro_id" ], call.data[ "steps" ] )
+
+	async def async_remove_macro( call: ServiceCall ) -> None:
+
+		for data in hass.data.get( DOMAIN, {} ).values():
+
+			if "macro" in data: data[ "macro" ].async_delete( call.data[ "macro_id" ] )
+
+	async def async_run_macro( call: ServiceCall ) -> ServiceResponse:
+
+		for data in hass.data.get( DOMAIN, {} ).values():
+
+			if "macro" not in data: continue
+
+			result = await data[ "macro" ].async_run( call.data[ "macro_id" ] )
+
+			if result is not None: return result
+
+		raise HomeAssistantError( f"Unknown Macro {call.data[ 'macro_id' ]}" )
+
+	if not hass.services.has_service( DOMAIN, SERVICE_RUN_MACRO ):
+
+		hass.services.async_register(
+			DOMAIN,
+			SERVICE_RUN_MACRO,
+			async_run_macro,
+			schema = MACRO_SCHEMA,
+			supports_response = SupportsResponse.OPTIONAL,
+		)
+
+	for service, handler, schema in (
+		( SERVICE_SET_SCHEDULE,    async_set_schedule,    SET_SCHEDULE_SCHEMA    ),
+		( SERVICE_REMOVE_SCHEDULE, async_remove_schedule, REMOVE_SCHEDULE_SCHEMA ),
+		( SERVICE_BIND_BLASTERS,   async_bind_blasters,   BIND_BLASTERS_SCHEMA   ),
+		( SERVICE_SET_MACRO,       async_set_macro,       SET_MACRO_SCHEMA       ),
+		( SERVICE_REMOVE_MACRO,    async_remove_macro,    MACRO_SCHEMA           ),
+	):
+
+		if not hass.services.has_service( DOMAIN, service ):
+
+			hass.services.async_register( DOMAIN, service, handler, schema = schema )
+
+	if not hass.services.has_service( DOMAIN, SERVICE_PROFILE ):
+
+		hass.services.async_register(
+			DOMAIN,
+			SERVICE_PROFILE,
+			async_profile,
+			schema = PROFILE_SCHEMA,
+			supports_response = SupportsResponse.OPTIONAL,
+		)
+
+	if not hass.services.has_service( DOMAIN, SERVICE_REMOVE_DEVICES ):
+
+		hass.services.async_register(
+			DOMAIN,
+			SERVICE_REMOVE_DEVICES,
+			async_remove_devices,
+			schema = REMOVE_DEVICES_SCHEMA,
+			supports_response = SupportsResponse.OPTIONAL,
+		)
+
+@callback
+def async_unload_services( hass: HomeAssistant ) -> None:
+
+	hass.services.async_remove( DOMAIN, SERVICE_PROFILE )
+
+	hass.services.async_remove( DOMAIN, SERVICE_REMOVE_DEVICES )
+
+	hass.services.async_remove( DOMAIN, SERVICE_SET_SCHEDULE )
+
+	hass.services.async_remove( DOMAIN, SERVICE_REMOVE_SCHEDULE )
+
+	hass.services.async_remove( DOMAIN, SERVICE_BIND_BLASTERS )
+
+	hass.services.async_remove( DOMAIN, SERVICE_SET_MACRO )
+
+	hass.services.async_remove( DOMAIN, SERVICE_REMOVE_MACRO )
+
+	hass.services.async_remove( DOMAIN, SERVICE_RUN_MACRO )
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from collections.abc import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+	DOMAIN,
+	TASK_LIMITS,
+)
+
+_LOGGING = logging.getLogger( __name__ )
+
+class TaskManager:
+
+	def __init__( self, hass: HomeAssistant ):
+
+		self.hass = hass
+
+		self._semaphores = { kind: asyncio.Semaphore( limit ) for kind, limit in TASK_LIMITS.items() }
+
+		self._pending = {}
+
+		self._tasks = set()
+
+		self.stats = {
+			"pending":   0,
+			"in_flight": 0,
+			"completed": 0,
+			"failed":    0,
+			"replaced":  0,
+			"cancelled": 0,
+		}
+
+	@callback
+	def async_submit( self, kind: str, key, factory: Callable[ [], Awaitable ] ) -> None:
+
+		if key is None: key = object()
+
+		slot = ( kind, key )
+
+		if slot in self._pending:
+
+			self._pending[ slot ] = factory
+
+			self.stats[ "replaced" ] += 1
+
+			return
+
+		self._pending[ slot ] = factory
+
+		self.stats[ "pending" ] = len( self._pending )
+
+		task = self.hass.async_create_background_task( self.__async_run( slot ), f"{DOMAIN}_{kind}" )
+
+		self._tasks.add( task )
+
+		task.add_done_callback( self._tasks.discard )
+
+	async def async_shutdown( self ) -> None:
+
+		tasks = list( self._tasks )
+
+		for task in tasks: task.cancel()
+
+		if tasks: await asyncio.gather( *tasks, return_exceptions = True )
+
+		self._pending.clear()
+
+		self.stats[ "pending"   ] = 0
+		self.stats[ "cancelled" ] += len( tasks )
+
+	async def __async_run( self, slot ) -> None:
+
+		async with self._semaphores[ slot[ 0 ] ]:
+
+			factory = self._pending.pop( slot )
+
+			self.stats[ "pending"   ] = len( self._pending )
+			self.stats[ "in_flight" ] += 1
+
+			try:
+				await factory()
+
+			except asyncio.CancelledError:
+				raise
+
+			except Exception as err:
+				self.stats[ "failed" ] += 1
+
+				_LOGGING.warning( f"Task {slot[ 0 ]} Failed: {err}" )
+
+			else:
+				self.stats[ "completed" ] += 1
+
+			finally:
+				self.stats[ "in_flight" ] -= 1
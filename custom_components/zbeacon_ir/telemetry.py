@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.const import (
+	SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+	UnitOfInformation,
+	UnitOfTemperature,
+	UnitOfTime,
+)
+
+from homeassistant.components.sensor import (
+	SensorDeviceClass,
+	SensorEntityDescription,
+	SensorStateClass,
+)
+
+from .mqtt import MQTTClient
+
+@dataclass( frozen = True, kw_only = True )
+class TelemetrySensorEntityDescription( SensorEntityDescription ):
+
+	topic: str
+
+	value_fn: Callable[ [ dict ], Any ]
+
+	interval: float = 0.0
+
+	deadband: float = 0.0
+
+def _get( payload: dict, *path: str ):
+
+	for key in path:
+
+		if not isinstance( payload, dict ): return None
+
+		payload = payload.get( key )
+
+	return payload
+
+TELEMETRY_SENSORS: tuple[ TelemetrySensorEntityDescription, ... ] = (
+	TelemetrySensorEntityDescription(
+		key                         = "uptime",
+		translation_key             = "sensor_uptime",
+		topic                       = "STATE",
+		value_fn                    = lambda payload: _get( payload, "UptimeSec" ),
+		device_class                = SensorDeviceClass.DURATION,
+		state_class                 = SensorStateClass.TOTAL_INCREASING,
+		native_unit_of_measurement  = UnitOfTime.SECONDS,
+		interval                    = 3600.0,
+	),
+	TelemetrySensorEntityDescription(
+		key                         = "rssi",
+		translation_key             = "sensor_rssi",
+		topic                       = "STATE",
+		value_fn                    = lambda payload: _get( payload, "Wifi", "Signal" ),
+		device_class                = SensorDeviceClass.SIGNAL_STRENGTH,
+		state_class                 = SensorStateClass.MEASUREMENT,
+		native_unit_of_measurement  = SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+		interval                    = 300.0,
+		deadband                    = 3.0,
+	),
+	TelemetrySensorEntityDescription(
+		key                         = "heap",
+		translation_key             = "sensor_heap",
+		topic                       = "STATE",
+		value_fn                    = lambda payload: _get( payload, "Heap" ),
+		device_class                = SensorDeviceClass.DATA_SIZE,
+		state_class                 = SensorStateClass.MEASUREMENT,
+		native_unit_of_measurement  = UnitOfInformation.KILOBYTES,
+		interval                    = 300.0,
+		deadband                    = 2.0,
+	),
+	TelemetrySensorEntityDescription(
+		key                         = "load_avg",
+		translation_key             = "sensor_load_avg",
+		topic                       = "STATE",
+		value_fn                    = lambda payload: _get( payload, "LoadAvg" ),
+		state_class                 = SensorStateClass.MEASUREMENT,
+		interval                    = 300.0,
+		deadband                    = 5.0,
+	),
+	TelemetrySensorEntityDescription(
+		key                         = "temperature",
+		translation_key             = "sensor_temperature",
+		topic                       = "SENSOR",
+		value_fn                    = MQTTClient.parse_temperature,
+		device_class                = SensorDeviceClass.TEMPERATURE,
+		state_class                 = SensorStateClass.MEASUREMENT,
+		native_unit_of_measurement  = UnitOfTemperature.CELSIUS,
+		interval                    = 60.0,
+		deadband                    = 0.2,
+	),
+)
+
+def telemetry_should_write( description: TelemetrySensorEntityDescription, value, written_value, written: float | None, now: float ) -> bool:
+
+	if written_value is None or written is None: return True
+
+	if now - written < description.interval: return False
+
+	if not isinstance( value, ( int, float ) ) or not isinstance( written_value, ( int, float ) ):
+
+		return value != written_value
+
+	return abs( value - written_value ) >= description.deadband
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import random
+import asyncio
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import (
+	MockConfigEntry,
+	async_fire_mqtt_message,
+	async_fire_time_changed,
+)
+
+from custom_components.zbeacon_ir.const import (
+	DOMAIN,
+	INGEST_WINDOW,
+	STORE_SAVE_DELAY,
+)
+
+IRHVAC = {
+	"Vendor":   "GREE",
+	"Model":    -1,
+	"Command":  "Control",
+	"Mode":     "Cool",
+	"Power":    "On",
+	"Celsius":  "On",
+	"Temp":     26,
+	"FanSpeed": "Auto",
+	"SwingV":   "Off",
+	"SwingH":   "Off",
+}
+
+@pytest.fixture( autouse = True )
+def auto_enable_custom_integrations( enable_custom_integrations ):
+
+	yield
+
+class FakeBroker:
+
+	def __init__( self, hass: HomeAssistant ):
+
+		self.hass = hass
+
+		self.published = []
+
+		self.latency = 0.0
+
+		self.loss = 0.0
+
+		self.echo = True
+
+		self.silent = set()
+
+		self.echoed = 0
+
+		self.dropped = 0
+
+		self._random = random.Random( 0 )
+
+	@staticmethod
+	def blasters( count: int, start: int = 0 ) -> list[ dict ]:
+
+		return [
+			{
+				"ip":  f"10.{( index >> 16 ) & 0xff}.{( index >> 8 ) & 0xff}.{index & 0xff}",
+				"dn":  f"Athom {index}",
+				"hn":  f"athom-{index:06x}",
+				"mac": f"AABBCC{index:06X}",
+				"md":  "Athom IR Remote",
+				"t":   f"athom_{index:06x}",
+				"sw":  "14.2.0(tasmota)",
+			}
+			for index in range( start, start + count )
+		]
+
+	def fire( self, topic: str, payload ) -> None:
+
+		if isinstance( payload, dict ): payload = json.dumps( payload )
+
+		# The integration is subscribed before any blaster publishes, so a broker forwards even retained
+		# discovery and LWT live, without the retain flag HA would use to drop repeats
+
+		async_fire_mqtt_message( self.hass, topic, payload )
+
+	def discover( self, blasters: list[ dict ] ) -> None:
+
+		for blaster in blasters:
+
+			self.fire( f"tasmota/discovery/{blaster[ 'mac' ]}/config", blaster )
+
+	def lwt( self, blasters: list[ dict ], status: str = "Online" ) -> None:
+
+		for blaster in blasters:
+
+			self.fire( f"tele/{blaster[ 't' ]}/LWT", status )
+
+	def report( self, blasters: list[ dict ], irhvac: dict | None = None ) -> None:
+
+		for blaster in blasters:
+
+			self.fire( f"stat/{blaster[ 't' ]}/RESULT", { "IRHVAC": irhvac or IRHVAC } )
+
+	def sensor( self, blasters: list[ dict ], temperature: float ) -> None:
+
+		for blaster in blasters:
+
+			self.fire( f"tele/{blaster[ 't' ]}/SENSOR", { "DS18B20": { "Temperature": temperature }, "TempUnit": "C" } )
+
+	async def async_feed( self, feed, blasters: list[ dict ], *args, chunk: int = 50 ) -> None:
+
+		for index in range( 0, len( blasters ), chunk ):
+
+			feed( blasters[ index:index + chunk ], *args )
+
+			await asyncio.sleep( 0 )
+
+	async def async_publish( self, hass: HomeAssistant, topic: str, payload, qos = 0, retain = False, encoding = "utf-8" ) -> None:
+
+		self.published.append( ( topic, payload ) )
+
+		parts = topic.split( "/" )
+
+		if not self.echo or len( parts ) != 3 or parts[ 0 ] != "cmnd" or parts[ 2 ] != "IRHVAC" or parts[ 1 ] in self.silent: return
+
+		if self._random.random() < self.loss:
+
+			self.dropped += 1
+
+			return
+
+		result = { "IRHVAC": json.loads( payload ) }
+
+		if self.latency > 0:
+
+			self.hass.loop.call_later( self.latency, self.__echo, parts[ 1 ], result )
+		else:
+			self.__echo( parts[ 1 ], result )
+
+	def __echo( self, topic: str, result: dict ) -> None:
+
+		self.echoed += 1
+
+		self.fire( f"stat/{topic}/RESULT", result )
+
+	def count( self, suffix: str ) -> int:
+
+		return sum( 1 for topic, _ in self.published if topic.endswith( suffix ) )
+
+	async def async_settle( self, seconds: float = INGEST_WINDOW + STORE_SAVE_DELAY ) -> None:
+
+		async_fire_time_changed( self.hass, dt_util.utcnow() + timedelta( seconds = seconds ) )
+
+		await self.hass.async_block_till_done( wait_background_tasks = True )
+
+class LoopMonitor:
+
+	def __init__( self, interval: float = 0.005 ):
+
+		self.interval = interval
+
+		self.blocked = 0.0
+
+		self._task = None
+
+	async def __aenter__( self ) -> LoopMonitor:
+
+		self._task = asyncio.create_task( self.__async_probe() )
+
+		return self
+
+	async def __aexit__( self, *exc ) -> None:
+
+		self._task.cancel()
+
+		await asyncio.gather( self._task, return_exceptions = True )
+
+	async def __async_probe( self ) -> None:
+
+		while True:
+
+			start = time.perf_counter()
+
+			await asyncio.sleep( self.interval )
+
+			self.blocked = max( self.blocked, time.perf_counter() - start - self.interval )
+
+@pytest.fixture
+async def broker( hass: HomeAssistant, mqtt_mock, tmp_path ):
+
+	hass.config.config_dir = str( tmp_path )
+
+	os.makedirs( os.path.join( tmp_path, ".storage" ), exist_ok = True )
+
+	broker = FakeBroker( hass )
+
+	with patch( "homeassistant.components.mqtt.async_publish", broker.async_publish ):
+
+		yield broker
+
+async def async_setup_integration( hass: HomeAssistant, options: dict | None = None ) -> MockConfigEntry:
+
+	entry = MockConfigEntry( domain = DOMAIN, title = "ZbeaconIR", data = {}, options = options or {} )
+
+	entry.add_to_hass( hass )
+
+	assert await hass.config_entries.async_setup( entry.entry_id )
+
+	await hass.async_block_till_done()
+
+	return entry
+
+def dispatcher_targets( hass: HomeAssistant, prefix: str = "zbeacon_ir_" ) -> int:
+
+	return sum(
+		len( targets )
+		for signal, targets in hass.data.get( DATA_DISPATCHER, {} ).items()
+		if isinstance( signal, str ) and signal.startswith( prefix )
+	)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.zbeacon_ir.const import DOMAIN, GROUP_ACK_TIMEOUT, GROUP_PROBE_INTERVAL
+
+from .conftest import FakeBroker, async_setup_integration
+
+async def async_setup_group( hass: HomeAssistant, broker: FakeBroker, strategy: str ):
+
+	entry = await async_setup_integration( hass )
+
+	client = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+	primary, member = broker.blasters( 2 )
+
+	broker.lwt( [ primary, member ] )
+
+	broker.discover( [ primary, member ] )
+
+	broker.report( [ primary, member ] )
+
+	await broker.async_settle()
+
+	assert client.async_bind( primary[ "mac" ], [ member[ "mac" ] ], strategy )
+
+	return client, primary, member
+
+async def test_best_skips_member_without_acknowledgements( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	client, primary, member = await async_setup_group( hass, broker, "best" )
+
+	broker.echo = False
+
+	now = time.monotonic()
+
+	client._health[ primary[ "mac" ] ] = { "ack": 1.0, "latency": 0.2, "tried": now }
+	client._health[ member[ "mac" ]  ] = { "ack": 0.0, "latency": None, "tried": now }
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	assert [ topic for topic, _ in broker.published if topic.endswith( "/IRHVAC" ) ] == [ f"cmnd/{primary[ 't' ]}/IRHVAC" ]
+
+async def test_member_echo_keeps_member_state( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	client, primary, member = await async_setup_group( hass, broker, "all" )
+
+	client.find_device( primary[ "mac" ] )[ "irhvac" ][ "Mode" ] = "Heat"
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	await broker.async_settle()
+
+	assert broker.count( "/IRHVAC" ) == 2
+
+	assert broker.echoed == 2
+
+	assert client.find_device( primary[ "mac" ] )[ "irhvac" ][ "Mode" ] == "Heat"
+	assert client.find_device( member[ "mac" ] )[ "irhvac" ][ "Mode" ] == "Cool"
+
+	assert client._latency[ member[ "mac" ] ][ "count" ] == 1
+
+	assert client._sent == {}
+
+def irhvac_targets( broker: FakeBroker ) -> list[ str ]:
+
+	targets = [ topic.split( "/" )[ 1 ] for topic, _ in broker.published if topic.endswith( "/IRHVAC" ) ]
+
+	broker.published.clear()
+
+	return targets
+
+def age( client, uuid: str, seconds: float ) -> None:
+
+	health = client._health[ uuid ]
+
+	health[ "tried" ] -= seconds
+
+	if uuid in client._sent:
+
+		sent, primary = client._sent[ uuid ]
+
+		client._sent[ uuid ] = ( sent - seconds, primary )
+
+async def test_best_moves_off_degrading_primary( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	client, primary, member = await async_setup_group( hass, broker, "best" )
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	await broker.async_settle()
+
+	assert sorted( irhvac_targets( broker ) ) == sorted( [ primary[ "t" ], member[ "t" ] ] )
+
+	for _ in range( 50 ):
+
+		await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+		await broker.async_settle()
+
+	assert irhvac_targets( broker ) == [ primary[ "t" ] ] * 50
+
+	broker.silent.add( primary[ "t" ] )
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	age( client, primary[ "mac" ], GROUP_ACK_TIMEOUT )
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	await broker.async_settle()
+
+	assert irhvac_targets( broker ) == [ primary[ "t" ], member[ "t" ] ]
+
+	assert client._sent == {}
+
+async def test_best_probes_idle_member( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	client, primary, member = await async_setup_group( hass, broker, "best" )
+
+	broker.silent.add( member[ "t" ] )
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	age( client, member[ "mac" ], GROUP_ACK_TIMEOUT )
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	await broker.async_settle()
+
+	assert irhvac_targets( broker ) == [ primary[ "t" ], member[ "t" ], primary[ "t" ] ]
+
+	assert client._health[ member[ "mac" ] ][ "ack" ] == 0.0
+
+	broker.silent.clear()
+
+	age( client, member[ "mac" ], GROUP_PROBE_INTERVAL )
+
+	await client.async_cmnd_irhvac( primary[ "mac" ] )
+
+	await broker.async_settle()
+
+	assert irhvac_targets( broker ) == [ primary[ "t" ], member[ "t" ] ]
+
+	assert client._health[ member[ "mac" ] ][ "ack" ] > 0.0
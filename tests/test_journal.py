@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import save_json
+from homeassistant.helpers.storage import Store
+
+from custom_components.zbeacon_ir.journal import DeviceJournal, _journal_append
+
+from .conftest import IRHVAC
+
+BENCH_DEVICES = 10000
+
+BENCH_ROUNDS = 200
+
+def synthetic_device( index: int ) -> dict:
+
+	return {
+		"uuid":   f"AABBCC{index:06X}",
+		"topic":  f"athom_{index:06x}",
+		"LWT":    "Online",
+		"irhvac": dict( IRHVAC ),
+	}
+
+async def async_open( hass: HomeAssistant, path: str ) -> tuple[ DeviceJournal, dict ]:
+
+	journal = DeviceJournal( hass, Store( hass, 1, "zbeacon_ir_journal_test" ), path )
+
+	return journal, await journal.async_load()
+
+async def test_compact_crash_does_not_resurrect_removed_device( hass: HomeAssistant, tmp_path, hass_storage ) -> None:
+
+	path = str( tmp_path / "zbeacon_ir_journal_test.journal" )
+
+	journal, cache = await async_open( hass, path )
+
+	device = synthetic_device( 0 )
+
+	cache[ device[ "uuid" ] ] = device
+
+	journal.async_mark( device[ "uuid" ] )
+
+	await journal.async_flush()
+
+	del cache[ device[ "uuid" ] ]
+
+	journal.async_mark( device[ "uuid" ] )
+
+	with patch( "custom_components.zbeacon_ir.journal._journal_truncate" ):
+
+		await journal.async_compact()
+
+	await journal.async_close()
+
+	assert os.path.getsize( path ) > 0
+
+	journal, cache = await async_open( hass, path )
+
+	assert device[ "uuid" ] not in cache
+
+	await journal.async_close()
+
+async def test_replay_applies_entries_after_snapshot( hass: HomeAssistant, tmp_path, hass_storage ) -> None:
+
+	path = str( tmp_path / "zbeacon_ir_journal_test.journal" )
+
+	journal, cache = await async_open( hass, path )
+
+	first, second = synthetic_device( 0 ), synthetic_device( 1 )
+
+	cache[ first[ "uuid" ] ] = first
+
+	journal.async_mark( first[ "uuid" ] )
+
+	await journal.async_compact()
+
+	cache[ second[ "uuid" ] ] = second
+
+	first[ "irhvac" ][ "Temp" ] = 18
+
+	journal.async_mark( first[ "uuid" ] )
+	journal.async_mark( second[ "uuid" ] )
+
+	await journal.async_flush()
+
+	await journal.async_close()
+
+	journal, cache = await async_open( hass, path )
+
+	assert cache[ first[ "uuid" ] ][ "irhvac" ][ "Temp" ] == 18
+
+	assert second[ "uuid" ] in cache
+
+	await journal.async_close()
+
+async def test_legacy_snapshot_loads( hass: HomeAssistant, tmp_path, hass_storage ) -> None:
+
+	device = synthetic_device( 0 )
+
+	hass_storage[ "zbeacon_ir_journal_test" ] = { "version": 1, "minor_version": 1, "key": "zbeacon_ir_journal_test", "data": { device[ "uuid" ]: device } }
+
+	journal, cache = await async_open( hass, str( tmp_path / "zbeacon_ir_journal_test.journal" ) )
+
+	assert cache == { device[ "uuid" ]: device }
+
+	await journal.async_close()
+
+@pytest.mark.slow
+async def test_benchmark_journal_against_store( tmp_path ) -> None:
+
+	cache = { device[ "uuid" ]: device for device in map( synthetic_device, range( BENCH_DEVICES ) ) }
+
+	uuids = list( cache )
+
+	store_path = str( tmp_path / "zbeacon_ir_store" )
+
+	start = time.perf_counter()
+
+	store_bytes = 0
+
+	for n in range( BENCH_ROUNDS ):
+
+		cache[ uuids[ n ] ][ "irhvac" ][ "Temp" ] = 16 + n % 14
+
+		save_json( store_path, { "version": 1, "minor_version": 1, "key": "zbeacon_ir_store", "data": cache } )
+
+		store_bytes += os.path.getsize( store_path )
+
+	store_seconds = time.perf_counter() - start
+
+	journal_path = str( tmp_path / "zbeacon_ir_store.journal" )
+
+	start = time.perf_counter()
+
+	for n in range( BENCH_ROUNDS ):
+
+		cache[ uuids[ n ] ][ "irhvac" ][ "Temp" ] = 16 + n % 14
+
+		_journal_append( journal_path, [ json.dumps( { "s": n + 1, "k": uuids[ n ], "v": cache[ uuids[ n ] ] }, separators = ( ",", ":" ) ) + "\n" ] )
+
+	journal_seconds = time.perf_counter() - start
+
+	journal_bytes = os.path.getsize( journal_path )
+
+	report = (
+		f"{BENCH_DEVICES} devices, {BENCH_ROUNDS} single-device changes, "
+		f"store {store_seconds * 1000 / BENCH_ROUNDS:.3f} ms {store_bytes / BENCH_ROUNDS:.0f} bytes per change, "
+		f"journal {journal_seconds * 1000 / BENCH_ROUNDS:.3f} ms {journal_bytes / BENCH_ROUNDS:.0f} bytes per change"
+	)
+
+	assert journal_bytes * 100 < store_bytes, report
+
+	assert journal_seconds * 2 < store_seconds, report
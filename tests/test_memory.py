@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import gc
+import os
+import tracemalloc
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+import custom_components.zbeacon_ir as zbeacon_ir
+
+from custom_components.zbeacon_ir.const import DOMAIN, ZBEACON_IR_EVENT_DEVICE_MSG
+
+from .conftest import FakeBroker, async_setup_integration, dispatcher_targets
+
+# Recorded budgets, retained bytes per device after discovery, LWT, RESULT and SENSOR.
+# TOTAL covers everything HA keeps for the device ( registries, states, entities ),
+# OWN only allocations made directly by the integration ( indexes, cache, entities ).
+# Measured on Python 3.13 / HA 2026.2: TOTAL 106323-111316 at 1k and 110776 at 10k,
+# OWN 7732-7737 at 1k and 7720 at 10k, plus about 10%.
+
+TOTAL_BYTES_PER_DEVICE = 120 * 1024
+
+OWN_BYTES_PER_DEVICE = 8704
+
+POPULATE_CHUNK = 1000
+
+PACKAGE = os.path.dirname( zbeacon_ir.__file__ )
+
+async def async_populate( broker: FakeBroker, blasters: list[ dict ] ) -> None:
+
+	broker.lwt( blasters )
+
+	broker.discover( blasters )
+
+	await broker.async_settle()
+
+	broker.report( blasters )
+
+	broker.sensor( blasters, 24.5 )
+
+	await broker.async_settle()
+
+@pytest.mark.parametrize( "count", [ 1000, pytest.param( 10000, marks = pytest.mark.slow ) ] )
+async def test_memory_per_device( hass: HomeAssistant, broker: FakeBroker, count: int ) -> None:
+
+	entry = await async_setup_integration( hass )
+
+	client = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+	blasters = broker.blasters( count )
+
+	gc.collect()
+
+	tracemalloc.start()
+
+	# Chunks keep queued entities from piling up while traced, 10k devices in one burst need more than 5 GiB
+
+	try:
+		for index in range( 0, count, POPULATE_CHUNK ):
+
+			await async_populate( broker, blasters[ index:index + POPULATE_CHUNK ] )
+
+		gc.collect()
+
+		total = tracemalloc.get_traced_memory()[ 0 ]
+
+		own = sum( stat.size for stat in tracemalloc.take_snapshot().filter_traces( [ tracemalloc.Filter( True, os.path.join( PACKAGE, "*" ) ) ] ).statistics( "filename" ) )
+
+	finally:
+		tracemalloc.stop()
+
+	assert len( client.device_uuids() ) == count
+
+	assert total / count < TOTAL_BYTES_PER_DEVICE, f"{total / count:.0f} bytes per device"
+
+	assert own / count < OWN_BYTES_PER_DEVICE, f"{own / count:.0f} bytes per device"
+
+async def test_unload_releases_indexes( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	entry = await async_setup_integration( hass )
+
+	client = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+	blasters = broker.blasters( 200 )
+
+	broker.lwt( broker.blasters( 10, 1000 ) )
+
+	await async_populate( broker, blasters )
+
+	assert client._devices and client._telemetry and client._heard and client._created and client._lwt
+
+	assert dispatcher_targets( hass ) > 0
+
+	assert await hass.config_entries.async_unload( entry.entry_id )
+
+	await hass.async_block_till_done()
+
+	assert client._devices   == {}
+	assert client._cache     == {}
+	assert client._lwt       == {}
+	assert client._telemetry == {}
+	assert client._heard     == {}
+	assert client._created   == set()
+	assert client._pending   == {}
+	assert client._groups    == {}
+
+	assert client._sub_state is None
+
+	assert client.tasks.stats[ "pending" ] == 0
+
+	assert dispatcher_targets( hass ) == 0
+
+	assert DOMAIN not in hass.data or entry.entry_id not in hass.data[ DOMAIN ]
+
+async def test_reset_releases_device( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	entry = await async_setup_integration( hass )
+
+	client = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+	blasters = broker.blasters( 20 )
+
+	await async_populate( broker, blasters )
+
+	blaster = blasters[ 0 ]
+
+	uuid, topic = blaster[ "mac" ], blaster[ "t" ]
+
+	assert dispatcher_targets( hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}" ) > 0
+
+	entity_id = er.async_get( hass ).async_get_entity_id( "button", DOMAIN, f"{uuid}_reset" )
+
+	await hass.services.async_call( "button", "press", { "entity_id": entity_id }, blocking = True )
+
+	await broker.async_settle()
+
+	assert uuid  not in client._devices
+	assert topic not in client._devices
+	assert uuid  not in client._cache
+	assert uuid  not in client._telemetry
+	assert uuid  not in client._heard
+	assert uuid  not in client._created
+
+	assert topic not in client._lwt
+
+	assert dispatcher_targets( hass, f"{ZBEACON_IR_EVENT_DEVICE_MSG}_{uuid}" ) == 0
+
+	assert er.async_get( hass ).async_get( entity_id ) is None
+
+	assert ( f"cmnd/{topic}/Reset", "1" ) in broker.published
+
+	assert len( client.device_uuids() ) == len( blasters ) - 1
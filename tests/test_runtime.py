@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.zbeacon_ir.const import DOMAIN, RUNTIME_REFRESH
+
+from .conftest import IRHVAC, FakeBroker, async_setup_integration
+
+async def async_setup_cooling( hass: HomeAssistant, broker: FakeBroker ):
+
+	entry = await async_setup_integration( hass )
+
+	data = hass.data[ DOMAIN ][ entry.entry_id ]
+
+	blaster = broker.blasters( 1 )[ 0 ]
+
+	broker.lwt( [ blaster ] )
+
+	broker.discover( [ blaster ] )
+
+	await broker.async_settle()
+
+	broker.report( [ blaster ] )
+
+	await broker.async_settle()
+
+	device = data[ "mqtt" ].find_device( blaster[ "mac" ] )
+
+	assert device[ "runtime" ][ "state" ][ 0 ] == "cool"
+
+	return data, device
+
+async def test_runtime_sensor_refreshes_while_running( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	_, device = await async_setup_cooling( hass, broker )
+
+	entity_id = er.async_get( hass ).async_get_entity_id( "sensor", DOMAIN, f"{device[ 'uuid' ]}_runtime_total" )
+
+	device[ "runtime" ][ "since" ] -= 3600
+
+	await broker.async_settle( RUNTIME_REFRESH + 1 )
+
+	assert float( hass.states.get( entity_id ).state ) >= 1.0
+
+	cool = er.async_get( hass ).async_get( er.async_get( hass ).async_get_entity_id( "sensor", DOMAIN, f"{device[ 'uuid' ]}_runtime_cool" ) )
+
+	assert cool.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+
+async def test_final_write_credits_open_interval( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	data, device = await async_setup_cooling( hass, broker )
+
+	device[ "runtime" ][ "since" ] -= 9 * 3600
+
+	append = data[ "journal" ].stats[ "append" ]
+
+	hass.bus.async_fire( EVENT_HOMEASSISTANT_FINAL_WRITE )
+
+	await hass.async_block_till_done()
+
+	assert device[ "runtime" ][ "state" ] is None
+
+	assert device[ "runtime" ][ "mode" ][ "cool" ] >= 9 * 3600
+
+	assert data[ "journal" ].stats[ "append" ] == append + 1
+
+async def test_restart_resumes_cached_cooling( hass: HomeAssistant, broker: FakeBroker, hass_storage ) -> None:
+
+	blaster = broker.blasters( 1 )[ 0 ]
+
+	uuid = blaster[ "mac" ]
+
+	entry = MockConfigEntry( domain = DOMAIN, title = "ZbeaconIR", data = {} )
+
+	hass_storage[ f"{DOMAIN}_{entry.entry_id}" ] = {
+		"version": 1,
+		"minor_version": 1,
+		"key": f"{DOMAIN}_{entry.entry_id}",
+		"data": {
+			"seq": 0,
+			"devices": {
+				uuid: {
+					"uuid":    uuid,
+					"topic":   blaster[ "t" ],
+					"LWT":     "Online",
+					"irhvac":  dict( IRHVAC ),
+					"runtime": { "mode": { "cool": 3600.0 }, "band": {}, "state": [ "cool", "26-28" ], "since": 0.0 },
+				}
+			}
+		}
+	}
+
+	entry.add_to_hass( hass )
+
+	assert await hass.config_entries.async_setup( entry.entry_id )
+
+	await hass.async_block_till_done()
+
+	broker.lwt( [ blaster ] )
+
+	broker.discover( [ blaster ] )
+
+	await broker.async_settle()
+
+	device = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ].find_device( uuid )
+
+	assert device[ "runtime" ][ "state" ] is not None and device[ "runtime" ][ "state" ][ 0 ] == "cool"
+
+	device[ "runtime" ][ "since" ] -= 1800
+
+	await broker.async_settle( RUNTIME_REFRESH + 1 )
+
+	entity_id = er.async_get( hass ).async_get_entity_id( "sensor", DOMAIN, f"{uuid}_runtime_total" )
+
+	assert float( hass.states.get( entity_id ).state ) >= 1.5
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.zbeacon_ir.const import DOMAIN
+
+from .conftest import FakeBroker, LoopMonitor, async_setup_integration
+
+pytestmark = pytest.mark.slow
+
+FLEET = int( os.environ.get( "ZBEACON_IR_FLEET", 5000 ) )
+
+# Recorded limits for 5000 devices, the loop limit is the longest single stall. Measured
+# on Python 3.13 / HA 2026.2 ( cold start 26.4s, storm 7.9s, mode change 3.8s, stall 2.49s,
+# 1.44ms per message ) plus a margin. The stall is one INGEST_BATCH_MAX batch of entities.
+
+COLD_START_SECONDS = 40.0
+
+STORM_SECONDS = 12.0
+
+MODE_CHANGE_SECONDS = 6.0
+
+BLOCKED_SECONDS = 3.5
+
+HANDLER_SECONDS_PER_MESSAGE = 0.002
+
+# Journal appends run on a real 1s timer, so their count follows wall-clock time. What must
+# hold is that each append batches many devices and no device is written more than once per change.
+
+DEVICES_PER_APPEND = 200
+
+async def async_cold_start( hass: HomeAssistant, broker: FakeBroker ):
+
+	entry = await async_setup_integration( hass )
+
+	data = hass.data[ DOMAIN ][ entry.entry_id ]
+
+	blasters = broker.blasters( FLEET )
+
+	await broker.async_feed( broker.lwt, blasters )
+
+	await broker.async_feed( broker.discover, blasters )
+
+	await broker.async_settle()
+
+	await broker.async_feed( broker.report, blasters )
+
+	await broker.async_settle()
+
+	return data[ "mqtt" ], data[ "journal" ], blasters
+
+def assert_journal( journal, before: dict, writes_per_device: int ) -> None:
+
+	written = journal.stats[ "written" ] - before[ "written" ]
+
+	append = journal.stats[ "append" ] - before[ "append" ]
+
+	assert written <= writes_per_device * FLEET, f"{written} devices written"
+
+	assert append == 0 or written / append >= min( DEVICES_PER_APPEND, FLEET ), f"{written} devices in {append} appends"
+
+	assert journal.stats[ "compact" ] - before[ "compact" ] <= 1
+
+def climate_entity_ids( hass: HomeAssistant, blasters: list[ dict ] ) -> list[ str ]:
+
+	ent_reg = er.async_get( hass )
+
+	return [ ent_reg.async_get_entity_id( "climate", DOMAIN, f"{blaster[ 'mac' ]}_irhvac" ) for blaster in blasters ]
+
+async def test_cold_start( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	start = time.perf_counter()
+
+	async with LoopMonitor() as monitor:
+
+		client, journal, blasters = await async_cold_start( hass, broker )
+
+	elapsed = time.perf_counter() - start
+
+	assert len( client.device_uuids() ) == FLEET
+
+	assert len( hass.states.async_entity_ids( "climate" ) ) == FLEET
+
+	assert elapsed < COLD_START_SECONDS, f"{elapsed:.1f}s"
+
+	assert monitor.blocked < BLOCKED_SECONDS, f"{monitor.blocked:.3f}s"
+
+	messages = client.stats[ "discovery" ] + client.stats[ "stat" ] + client.stats[ "tele" ]
+
+	assert client.stats[ "discovery" ] == FLEET
+
+	assert client.stats[ "busy" ] / messages < HANDLER_SECONDS_PER_MESSAGE, f"{client.stats[ 'busy' ] / messages * 1000:.2f}ms"
+
+	assert all( topic.endswith( "/STATE" ) for topic, _ in broker.published )
+
+	# async_load compacts once before any device arrives
+
+	assert_journal( journal, { "written": 0, "append": 0, "compact": 1 }, 2 )
+
+	assert client.tasks.stats[ "failed" ] == 0
+
+async def test_reconnect_storm( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	client, journal, blasters = await async_cold_start( hass, broker )
+
+	await broker.async_feed( broker.lwt, blasters, "Offline" )
+
+	await broker.async_settle()
+
+	for blaster in blasters:
+
+		client.find_device( blaster[ "mac" ] )[ "irhvac" ][ "Mode" ] = "Heat"
+
+		await client.async_cmnd_irhvac( blaster[ "mac" ] )
+
+	assert broker.count( "/IRHVAC" ) == 0
+
+	assert len( client._pending ) == FLEET
+
+	before = dict( journal.stats )
+
+	start = time.perf_counter()
+
+	async with LoopMonitor() as monitor:
+
+		await broker.async_feed( broker.discover, blasters )
+
+		await broker.async_feed( broker.lwt, blasters, "Online" )
+
+		await broker.async_settle()
+
+	elapsed = time.perf_counter() - start
+
+	assert elapsed < STORM_SECONDS, f"{elapsed:.1f}s"
+
+	assert monitor.blocked < BLOCKED_SECONDS, f"{monitor.blocked:.3f}s"
+
+	assert client._pending == {}
+
+	assert sorted( topic for topic, _ in broker.published if topic.endswith( "/IRHVAC" ) ) == sorted( f"cmnd/{blaster[ 't' ]}/IRHVAC" for blaster in blasters )
+
+	assert len( hass.states.async_entity_ids( "climate" ) ) == FLEET
+
+	assert_journal( journal, before, 2 )
+
+	assert client.tasks.stats[ "failed" ] == 0
+
+async def test_fleet_mode_change( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	client, journal, blasters = await async_cold_start( hass, broker )
+
+	broker.latency = 0.2
+
+	broker.loss = 0.01
+
+	entity_ids = climate_entity_ids( hass, blasters )
+
+	before = dict( journal.stats )
+
+	start = time.perf_counter()
+
+	async with LoopMonitor() as monitor:
+
+		await hass.services.async_call( "climate", "set_hvac_mode", { "entity_id": entity_ids, "hvac_mode": "heat" }, blocking = True )
+
+		await broker.async_settle()
+
+	elapsed = time.perf_counter() - start
+
+	assert elapsed < MODE_CHANGE_SECONDS, f"{elapsed:.1f}s"
+
+	assert monitor.blocked < BLOCKED_SECONDS, f"{monitor.blocked:.3f}s"
+
+	assert broker.count( "/IRHVAC" ) == FLEET
+
+	assert broker.echoed + broker.dropped == FLEET
+
+	assert sum( latency[ "count" ] for latency in client._latency.values() ) == broker.echoed
+
+	assert len( client._sent ) == broker.dropped
+
+	assert all( hass.states.get( entity_id ).state == "heat" for entity_id in entity_ids )
+
+	assert_journal( journal, before, 1 )
+
+	assert client.tasks.stats[ "failed" ] == 0
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.zbeacon_ir.const import DOMAIN, SERVICE_SET_MACRO, SERVICE_SET_SCHEDULE
+
+from .conftest import FakeBroker, async_setup_integration
+
+async def async_setup_fleet( hass: HomeAssistant, broker: FakeBroker, count: int = 2 ):
+
+	entry = await async_setup_integration( hass )
+
+	blasters = broker.blasters( count )
+
+	broker.lwt( blasters )
+
+	broker.discover( blasters )
+
+	broker.report( blasters )
+
+	await broker.async_settle()
+
+	return entry, hass.data[ DOMAIN ][ entry.entry_id ], blasters
+
+async def test_set_schedule_rejects_unsupported( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	_, data, blasters = await async_setup_fleet( hass, broker )
+
+	with pytest.raises( ServiceValidationError ):
+
+		await hass.services.async_call( DOMAIN, SERVICE_SET_SCHEDULE, {
+			"schedule_id": "morning",
+			"mac":         [ blaster[ "mac" ] for blaster in blasters ],
+			"time":        "08:00",
+			"temperature": 35,
+		}, blocking = True )
+
+	with pytest.raises( ServiceValidationError ):
+
+		await hass.services.async_call( DOMAIN, SERVICE_SET_SCHEDULE, {
+			"schedule_id": "morning",
+			"mac":         [ blasters[ 0 ][ "mac" ] ],
+			"time":        "08:00",
+			"fan_mode":    "turbo",
+		}, blocking = True )
+
+	assert data[ "schedule" ].schedules() == {}
+
+async def test_apply_skips_unsupported( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	_, data, blasters = await async_setup_fleet( hass, broker )
+
+	valid, invalid = ( blaster[ "mac" ] for blaster in blasters )
+
+	data[ "mqtt" ].find_device( valid )[ "irhvac" ][ "Vendor" ] = "DAIKIN"
+
+	schedule = { "mac": [ valid, invalid ], "time": "08:00", "weekdays": [], "hvac_mode": "heat", "temperature": 31, "fan_mode": None }
+
+	await data[ "schedule" ].async_apply( { valid: schedule, invalid: schedule } )
+
+	assert broker.count( "/IRHVAC" ) == 1
+
+	assert data[ "mqtt" ].find_device( valid   )[ "irhvac" ][ "Mode" ] == "Heat"
+	assert data[ "mqtt" ].find_device( invalid )[ "irhvac" ][ "Mode" ] == "Cool"
+
+async def test_reload_keeps_schedules_and_macros( hass: HomeAssistant, broker: FakeBroker, hass_storage ) -> None:
+
+	entry, _, blasters = await async_setup_fleet( hass, broker )
+
+	await hass.services.async_call( DOMAIN, SERVICE_SET_SCHEDULE, {
+		"schedule_id": "morning",
+		"mac":         [ blasters[ 0 ][ "mac" ] ],
+		"time":        "08:00",
+		"hvac_mode":   "cool",
+	}, blocking = True )
+
+	await hass.services.async_call( DOMAIN, SERVICE_SET_MACRO, {
+		"macro_id": "scene",
+		"steps":    [ { "mac": blasters[ 0 ][ "mac" ], "command": "Power", "payload": "1" } ],
+	}, blocking = True )
+
+	assert await hass.config_entries.async_reload( entry.entry_id )
+
+	await hass.async_block_till_done()
+
+	data = hass.data[ DOMAIN ][ entry.entry_id ]
+
+	assert "morning" in data[ "schedule" ].schedules()
+
+	assert "scene" in data[ "macro" ]._macros
+
+	assert await hass.config_entries.async_remove( entry.entry_id )
+
+	await hass.async_block_till_done()
+
+	assert f"{DOMAIN}_{entry.entry_id}_schedules" not in hass_storage
+
+	assert f"{DOMAIN}_{entry.entry_id}_macros" not in hass_storage
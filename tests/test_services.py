@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.zbeacon_ir.const import DOMAIN, SERVICE_PROFILE, SERVICE_REMOVE_DEVICES
+
+from .conftest import FakeBroker, async_setup_integration
+
+async def test_remove_devices_by_topic( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	entry = await async_setup_integration( hass )
+
+	client = hass.data[ DOMAIN ][ entry.entry_id ][ "mqtt" ]
+
+	blasters = broker.blasters( 2 )
+
+	broker.lwt( blasters )
+
+	broker.discover( blasters )
+
+	await broker.async_settle()
+
+	by_topic, by_mac = blasters
+
+	dev_reg = dr.async_get( hass )
+
+	result = await hass.services.async_call( DOMAIN, SERVICE_REMOVE_DEVICES, {
+		"mac": [ by_topic[ "t" ], by_mac[ "mac" ], "missing" ],
+	}, blocking = True, return_response = True )
+
+	assert sorted( result[ "removed" ] ) == sorted( [ by_topic[ "mac" ], by_mac[ "mac" ] ] )
+
+	assert result[ "unknown" ] == [ "missing" ]
+
+	for blaster in blasters:
+
+		assert client.find_device( blaster[ "mac" ] ) is None
+
+		assert dev_reg.async_get_device( identifiers = { ( DOMAIN, blaster[ "mac" ] ) } ) is None
+
+async def test_profile_times_callbacks_and_commands( hass: HomeAssistant, broker: FakeBroker ) -> None:
+
+	entry = await async_setup_integration( hass )
+
+	journal = hass.data[ DOMAIN ][ entry.entry_id ][ "journal" ]
+
+	blasters = broker.blasters( 2 )
+
+	broker.lwt( blasters )
+
+	broker.discover( blasters )
+
+	broker.report( blasters )
+
+	await broker.async_settle()
+
+	entity_id = er.async_get( hass ).async_get_entity_id( "climate", DOMAIN, f"{blasters[ 0 ][ 'mac' ]}_irhvac" )
+
+	profile = hass.async_create_task( hass.services.async_call( DOMAIN, SERVICE_PROFILE, { "duration": 1 }, blocking = True, return_response = True ) )
+
+	await asyncio.sleep( 0 )
+
+	with pytest.raises( HomeAssistantError ):
+
+		await hass.services.async_call( DOMAIN, SERVICE_PROFILE, { "duration": 1 }, blocking = True, return_response = True )
+
+	broker.report( blasters )
+
+	await hass.services.async_call( "climate", "set_hvac_mode", { "entity_id": entity_id, "hvac_mode": "heat" }, blocking = True )
+
+	await journal.async_flush()
+
+	result = await profile
+
+	functions = { row[ "function" ]: row for row in result[ "top" ] }
+
+	assert functions[ "mqtt.stat" ][ "calls" ] >= len( blasters )
+
+	assert functions[ "climate.set_hvac_mode" ][ "calls" ] == 1
+
+	assert functions[ "journal.append" ][ "calls" ] == 1
+
+	assert os.path.isfile( result[ "file" ] )
+
+	with open( result[ "file" ], encoding = "utf-8" ) as f:
+
+		assert f"{DOMAIN};climate;set_hvac_mode " in f.read()
+
+	os.remove( result[ "file" ] )